@@ -17,6 +17,7 @@ __version__ = '1.0.3'
 
 import ceviche_challenges.beam_splitter
 import ceviche_challenges.defs
+import ceviche_challenges.fdfd
 import ceviche_challenges.mode_converter
 import ceviche_challenges.model_base
 import ceviche_challenges.modes
@@ -28,6 +28,27 @@ from ceviche_challenges.beam_splitter import spec as _spec
 import autograd.numpy as npa
 import numpy as np
 
+# Integer codes for the design symmetries supported by the beam splitter.
+_SYMMETRY_NONE = 0
+_SYMMETRY_X = 1
+_SYMMETRY_XY = 2
+_SYMMETRY_CODES = {'x': _SYMMETRY_X, 'xy': _SYMMETRY_XY}
+
+
+def _reflection_slice(size: int) -> slice:
+  """Slice reversing a design variable axis that is mirrored to `size` pixels.
+
+  For an odd `size` the last pixel of the design variable lies on the mirror
+  axis and is therefore not repeated in the reflection.
+
+  Args:
+    size: the size of the design region along the mirrored axis.
+
+  Returns:
+    A `slice` selecting the reflected part of the design variable axis.
+  """
+  return slice(-2, None, -1) if size % 2 else slice(None, None, -1)
+
 
 class BeamSplitterModel(model_base.Model):
   """A planar beam splitter with one design region, in ceviche."""
@@ -46,14 +67,30 @@ class BeamSplitterModel(model_base.Model):
       params: Parameters for the ceviche simulation.
       spec: Specification of the beam splitter geometry.
     """
+    super().__init__()
     self.params = params
     self.spec = spec
-    extent_i, extent_j = spec.extent_ij(params.resolution)
+    self._extent_ij = spec.extent_ij(params.resolution)
+    extent_i, extent_j = self._extent_ij
     self._shape = (
         u.resolve(extent_i, params.resolution),
         u.resolve(extent_j, params.resolution),
     )
-    self._make_bg_density_and_ports()
+    x_min = spec.pml_width + u.resolve(spec.wg_length, params.resolution)
+    x_max = x_min + u.resolve(spec.variable_region_size[0], params.resolution)
+    y_min = spec.pml_width + u.resolve(spec.wg_mode_padding, params.resolution)
+    y_max = y_min + u.resolve(spec.variable_region_size[1], params.resolution)
+    self._design_region_coords = (x_min, y_min, x_max, y_max)
+    self._design_region_shape = (x_max - x_min, y_max - y_min)
+    self._symmetry = _SYMMETRY_CODES.get(spec.design_symmetry, _SYMMETRY_NONE)
+    self._reflect_rows = _reflection_slice(self._design_region_shape[0])
+    self._reflect_cols = _reflection_slice(self._design_region_shape[1])
+    self._dl = params.resolution.to_value('m')
+    self._output_wavelengths = u.Array(params.wavelengths).to_value(u.nm)
+    self._output_wavelengths.flags.writeable = False
+    # The background density and ports are built on first access.
+    self._density_bg = None
+    self._ports = None
 
   def _make_bg_density_and_ports(self, init_design_region: bool = False):
     """Initializes background density and ports for the model.
@@ -70,28 +107,37 @@ class BeamSplitterModel(model_base.Model):
     p = self.params
     s = self.spec
 
-    density = np.zeros(self.shape)
-
     monitor_offset = u.resolve(s.input_monitor_offset, p.resolution)
 
+    extent_i, extent_j = self._extent_ij
     wgs_j = [
-        s.extent_ij(p.resolution)[1] / 2 - s.wg_separation / 2 - s.wg_width / 2,
-        s.extent_ij(p.resolution)[1] / 2 + s.wg_separation / 2 + s.wg_width / 2,
+        extent_j / 2 - s.wg_separation / 2 - s.wg_width / 2,
+        extent_j / 2 + s.wg_separation / 2 + s.wg_width / 2,
     ]
 
-    for wg_j in wgs_j:
-      y1 = u.resolve(wg_j - s.wg_width / 2, p.resolution)
-      y2 = u.resolve(wg_j + s.wg_width / 2, p.resolution)
-      density[:, y1:y2] = 1.0
+    # Both waveguides run along the full extent of the domain in i, so every
+    # pixel of the background is written exactly once by broadcasting a column
+    # mask, without first zero-filling the array.
+    y1_bot, y2_bot, y1_top, y2_top = [
+        u.resolve(y, p.resolution) for y in (
+            wgs_j[0] - s.wg_width / 2,
+            wgs_j[0] + s.wg_width / 2,
+            wgs_j[1] - s.wg_width / 2,
+            wgs_j[1] + s.wg_width / 2,
+        )
+    ]
+    wg_cols = np.zeros(self.shape[1], dtype=bool)
+    wg_cols[y1_bot:y2_bot] = True
+    wg_cols[y1_top:y2_top] = True
+    density = np.empty(self.shape)
+    density[:] = wg_cols
 
     port_i1 = s.pml_width + u.resolve(s.port_pml_offset, p.resolution)
-    port_i2 = u.resolve(
-        s.extent_ij(p.resolution)[0] - s.port_pml_offset,
-        p.resolution) - s.pml_width
-    port_js = [
-        u.resolve(j, p.resolution)
-        for j in [wgs_j[1], wgs_j[1], wgs_j[0], wgs_j[0]]
-    ]
+    port_i2 = u.resolve(extent_i - s.port_pml_offset,
+                        p.resolution) - s.pml_width
+    port_j_bot = u.resolve(wgs_j[0], p.resolution)
+    port_j_top = u.resolve(wgs_j[1], p.resolution)
+    port_js = [port_j_top, port_j_top, port_j_bot, port_j_bot]
     port_is = [port_i1, port_i2, port_i2, port_i1]
     port_dirs = [
         defs.Direction.X_POS,
@@ -100,19 +146,20 @@ class BeamSplitterModel(model_base.Model):
         defs.Direction.X_POS,
     ]
 
+    port_width = u.resolve(s.wg_width + 2 * s.wg_mode_padding, p.resolution)
     ports = []
     for port_i, port_j, port_dir in zip(port_is, port_js, port_dirs):
       ports.append(
           modes.WaveguidePort(
               x=port_i,
               y=port_j,
-              width=u.resolve(s.wg_width + 2 * s.wg_mode_padding, p.resolution),
+              width=port_width,
               order=1,
               dir=port_dir,
               offset=monitor_offset))
 
     if init_design_region:
-      density[self.design_region] = 1.0
+      density[self.design_region_slice] = 1.0
 
     self._density_bg = density
     self._ports = ports
@@ -140,61 +187,49 @@ class BeamSplitterModel(model_base.Model):
       An `np.ndarray` of shape `self.design_region_shape` that can be inlaid to
         the design region.
     """
-    s = self.spec
-    if s.design_symmetry == 'x':
-      if self.design_region_shape[1] % 2:
-        reflected = design_variable[:, :-1]
-      else:
-        reflected = design_variable
-      transformed_design_variable = npa.hstack((
-          design_variable,
-          npa.fliplr(reflected),
-      ))
-    elif s.design_symmetry == 'xy':
-      if self.design_region_shape[1] % 2:
-        reflected = design_variable[:, :-1]
-      else:
-        reflected = design_variable
-      transformed_design_variable = npa.hstack((
-          design_variable,
-          npa.fliplr(reflected),
-      ))
-      if self.design_region_shape[0] % 2:
-        reflected = transformed_design_variable[:-1,]
-      else:
-        reflected = transformed_design_variable
-      transformed_design_variable = npa.vstack((
-          transformed_design_variable,
-          npa.flipud(reflected),
-      ))
+    symmetry = self._symmetry
+    if symmetry == _SYMMETRY_NONE:
+      return design_variable
+    cols = self._reflect_cols
+    if symmetry == _SYMMETRY_X:
+      transformed_design_variable = npa.concatenate(
+          (design_variable, design_variable[:, cols]),
+          axis=1,
+      )
     else:
-      transformed_design_variable = design_variable
+      # All three mirrored quadrants are taken directly from the design
+      # variable, so that the full design is assembled in a single operation
+      # rather than through an intermediate, half-sized design.
+      rows = self._reflect_rows
+      transformed_design_variable = npa.block([
+          [design_variable, design_variable[:, cols]],
+          [design_variable[rows, :], design_variable[rows, cols]],
+      ])
     return transformed_design_variable
 
   @property
   def design_variable_shape(self) -> Tuple[int, int]:
     """Shape of the design variable, in grid units."""
-    s = self.spec
-    if s.design_symmetry == 'x':
-      i = self.design_region_shape[0]
-      j = np.ceil(self.design_region_shape[1] / 2)
-    elif s.design_symmetry == 'xy':
-      i = np.ceil(self.design_region_shape[0] / 2)
-      j = np.ceil(self.design_region_shape[1] / 2)
+    drs = self.design_region_shape
+    if self._symmetry == _SYMMETRY_X:
+      i = drs[0]
+      j = (drs[1] + 1) // 2
+    elif self._symmetry == _SYMMETRY_XY:
+      i = (drs[0] + 1) // 2
+      j = (drs[1] + 1) // 2
     else:
-      i, j = self.design_region_shape
+      i, j = drs
     return (int(i), int(j))
 
   @property
   def design_region_coords(self) -> Tuple[int, int, int, int]:
     """The coordinates of the design region as (x_min, y_min, x_max, y_max)."""
-    s = self.spec
-    p = self.params
-    x_min = s.pml_width + u.resolve(s.wg_length, p.resolution)
-    x_max = x_min + u.resolve(s.variable_region_size[0], p.resolution)
-    y_min = s.pml_width + u.resolve(s.wg_mode_padding, p.resolution)
-    y_max = y_min + u.resolve(s.variable_region_size[1], p.resolution)
-    return (x_min, y_min, x_max, y_max)
+    return self._design_region_coords
+
+  @property
+  def design_region_shape(self) -> Tuple[int, int]:
+    """Shape of the design region, in grid units."""
+    return self._design_region_shape
 
   @property
   def shape(self) -> Tuple[int, int]:
@@ -204,6 +239,8 @@ class BeamSplitterModel(model_base.Model):
   @property
   def density_bg(self) -> np.ndarray:
     """The background density distribution of the model."""
+    if self._density_bg is None:
+      self._make_bg_density_and_ports()
     return self._density_bg
 
   @property
@@ -221,8 +258,7 @@ class BeamSplitterModel(model_base.Model):
   @property
   def dl(self) -> float:
     """The grid resolution of the model."""
-    p = self.params
-    return p.resolution.to_value('m')
+    return self._dl
 
   @property
   def pml_width(self) -> int:
@@ -233,9 +269,11 @@ class BeamSplitterModel(model_base.Model):
   @property
   def ports(self) -> List[modes.Port]:
     """A list of the device ports."""
+    if self._ports is None:
+      self._make_bg_density_and_ports()
     return self._ports
 
   @property
   def output_wavelengths(self) -> List[float]:
     """A list of the wavelengths, in nm, to output fields and s-parameters."""
-    return u.Array(self.params.wavelengths).to_value(u.nm)
+    return self._output_wavelengths
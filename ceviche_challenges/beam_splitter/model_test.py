@@ -13,7 +13,8 @@
 # limitations under the License.
 """Tests for ceviche_challenges.beam_splitter.model."""
 
-from typing import Tuple
+import functools
+from typing import Optional, Tuple
 
 from absl.testing import absltest
 from absl.testing import parameterized
@@ -42,16 +43,51 @@ def init_design_var_feature(
   Returns:
     An `np.ndarray` corresponding to the initialized design variable.
   """
-  design_var = np.ones(shape)
   r0 = radius_scale * np.min(shape)
-  j, i = np.meshgrid(
-      np.arange(0, shape[1]),
-      np.arange(0, shape[0]),
-  )
+  i = np.arange(shape[0], dtype=np.float32)[:, np.newaxis]
+  j = np.arange(shape[1], dtype=np.float32)[np.newaxis, :]
   # Position the origin off center to break symmetry
   r = (i - shape[0] / 4)**2 + (j - shape[1] / 4)**2
-  design_var[r < r0] = 0.0
-  return design_var
+  return (r >= r0).astype(np.float64)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_model(
+    design_symmetry: Optional[str],
+    resolution_nm: float,
+) -> _model.BeamSplitterModel:
+  """Helper for building a pico splitter model, shared across test cases."""
+  spec = prefabs.pico_splitter_spec(design_symmetry=design_symmetry)
+  params = prefabs.pico_splitter_sim_params(resolution=resolution_nm * u.nm)
+  return _model.BeamSplitterModel(params, spec)
+
+
+def simulate_sparams_magnitude(
+    design_symmetry: Optional[str],
+    resolution: u.Quantity,
+    radius_scale: float,
+) -> np.ndarray:
+  """Helper for simulating the pico splitter with an embedded circular feature.
+
+  Args:
+    design_symmetry: the design symmetry of the pico splitter spec.
+    resolution: the resolution of the simulation.
+    radius_scale: a `float` specifying the radius of the circular feature
+      relative to the minimum dimension of the design variable.
+
+  Returns:
+    An `np.ndarray` with the magnitude of the full scattering matrix.
+  """
+  model = _build_model(design_symmetry, resolution.to_value(u.nm))
+  design_var = init_design_var_feature(
+      radius_scale,
+      model.design_variable_shape,
+  )
+  s_params, _ = model.simulate(
+      design_var,
+      excite_port_idxs=(0, 1, 2, 3),
+  )
+  return np.abs(s_params.squeeze())
 
 
 class ModelScatteringTest(parameterized.TestCase):
@@ -104,19 +140,7 @@ class ModelScatteringTest(parameterized.TestCase):
       radius_scale=2,
   ):
     """Test that the scattering matrix is symmetric (reciprocal) for a non-symmetric device."""
-    spec = prefabs.pico_splitter_spec(design_symmetry=None)
-    params = prefabs.pico_splitter_sim_params(resolution=resolution)
-    model = _model.BeamSplitterModel(params, spec)
-
-    design_var = init_design_var_feature(
-        radius_scale,
-        model.design_variable_shape,
-    )
-    s_params, _ = model.simulate(
-        design_var,
-        excite_port_idxs=(0, 1, 2, 3),
-    )
-    s = np.abs(s_params.squeeze())
+    s = simulate_sparams_magnitude(None, resolution, radius_scale)
     # Check overall scattering matrix symmetry
     np.testing.assert_allclose(
         s,
@@ -172,17 +196,7 @@ class ModelScatteringTest(parameterized.TestCase):
       radius_scale=2,
   ):
     """Test symmetry properties of the scattering matrix for an x-symmetric device."""
-    spec = prefabs.pico_splitter_spec(design_symmetry='x')
-    params = prefabs.pico_splitter_sim_params(resolution=resolution)
-    model = _model.BeamSplitterModel(params, spec)
-
-    design_var = init_design_var_feature(radius_scale,
-                                         model.design_variable_shape)
-    s_params, _ = model.simulate(
-        design_var,
-        excite_port_idxs=(0, 1, 2, 3),
-    )
-    s = np.abs(s_params.squeeze())
+    s = simulate_sparams_magnitude('x', resolution, radius_scale)
     # Check overall scattering matrix symmetry
     np.testing.assert_allclose(
         s,
@@ -251,17 +265,7 @@ class ModelScatteringTest(parameterized.TestCase):
       radius_scale=2,
   ):
     """Test symmetry properties of the scattering matrix for an yx-symmetric device."""
-    spec = prefabs.pico_splitter_spec(design_symmetry='xy')
-    params = prefabs.pico_splitter_sim_params(resolution=resolution)
-    model = _model.BeamSplitterModel(params, spec)
-
-    design_var = init_design_var_feature(radius_scale,
-                                         model.design_variable_shape)
-    s_params, _ = model.simulate(
-        design_var,
-        excite_port_idxs=(0, 1, 2, 3),
-    )
-    s = np.abs(s_params.squeeze())
+    s = simulate_sparams_magnitude('xy', resolution, radius_scale)
     # Check overall scattering matrix symmetry
     np.testing.assert_allclose(
         s,
@@ -527,6 +531,21 @@ class ModelDesignTest(parameterized.TestCase):
           design_var,
       )
 
+  @parameterized.parameters(None, 'x', 'xy')
+  def test_epsilon_r_matches_density(self, design_symmetry):
+    """Tests that the permittivity is that of the combined density."""
+    spec = prefabs.pico_splitter_spec(design_symmetry=design_symmetry)
+    params = prefabs.pico_splitter_sim_params(resolution=40 * u.nm)
+    model = _model.BeamSplitterModel(params, spec)
+
+    design_var = np.random.default_rng(0).random(model.design_variable_shape)
+    density = model.density(design_var)
+    np.testing.assert_array_equal(
+        model.epsilon_r(design_var),
+        model.cladding_permittivity +
+        (model.slab_permittivity - model.cladding_permittivity) * density,
+    )
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -36,25 +36,35 @@ class Direction(enum.Enum):
   @property
   def sign(self):
     """The sign (+/-) of the `Direction`."""
-    if self is self.Y_NEG or self is self.X_NEG:
-      return -1
-    else:
-      return +1
+    return _DIRECTION_SIGN[self]
 
   @property
   def is_along_x(self):
     """Is the `Direction` along the x-axis."""
-    if self is self.X_POS or self is self.X_NEG:
-      return True
-    else:
-      return False
+    return _DIRECTION_IS_ALONG_X[self]
 
   @property
   def is_along_y(self):
     """Is the `Direction` along the y-axis."""
-    return not self.is_along_x
+    return not _DIRECTION_IS_ALONG_X[self]
 
   @property
   def index(self):
     """Integer to index the component of a `VectorField` corresponding to the `Direction`."""
-    return np.abs(self.value) - 1
+    return _DIRECTION_INDEX[self]
+
+
+# Per-member lookup tables backing the `Direction` properties.
+_DIRECTION_SIGN = {
+    Direction.Y_NEG: -1,
+    Direction.X_NEG: -1,
+    Direction.X_POS: +1,
+    Direction.Y_POS: +1,
+}
+_DIRECTION_IS_ALONG_X = {
+    Direction.Y_NEG: False,
+    Direction.X_NEG: True,
+    Direction.X_POS: True,
+    Direction.Y_POS: False,
+}
+_DIRECTION_INDEX = {d: abs(d.value) - 1 for d in Direction}
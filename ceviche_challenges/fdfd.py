@@ -0,0 +1,99 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""FDFD solves for several sources, on top of `ceviche.fdfd_ez`.
+
+`ceviche.fdfd_ez.solve()` assembles and factorizes the system matrix for every
+source that it is called with. The functions in this module instead factorize
+the system matrix once for all of the sources, which requires the private
+methods of `ceviche.fdfd_ez`. This module is the only place where they are
+used, and `fdfd_test` checks it against `ceviche.fdfd_ez.solve()`, so that a
+change to them in `ceviche` fails the tests rather than the simulations.
+"""
+
+from typing import Tuple
+
+import autograd.numpy as npa
+import ceviche
+
+from ceviche_challenges import primitives
+
+import numpy as np
+
+# pylint: disable=protected-access
+
+
+def system_matrix(
+    sim: ceviche.fdfd_ez,
+    epsilon_r: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+  """The system matrix of a simulation for a permittivity distribution.
+
+  Args:
+    sim: The `ceviche.fdfd_ez` simulation, which specifies the frequency, the
+      grid and the PML of the system.
+    epsilon_r: The permittivity distribution, with the shape of the simulation
+      grid. It takes the place of the permittivity of `sim`.
+
+  Returns:
+    The entries of the system matrix, with shape `(num_non_zeros,)`, and their
+    row and column indices, with shape `(2, num_non_zeros)`.
+  """
+  return sim._make_A(sim._grid_to_vec(epsilon_r))
+
+
+def solve_ez(
+    sim: ceviche.fdfd_ez,
+    epsilon_r: np.ndarray,
+    sources: np.ndarray,
+) -> np.ndarray:
+  """Solves for the Ez fields of several sources with one factorization.
+
+  Each field is the same as the Ez field of `ceviche.fdfd_ez.solve()` for the
+  corresponding source, with `epsilon_r` as the permittivity of `sim`.
+
+  Args:
+    sim: The `ceviche.fdfd_ez` simulation, see `system_matrix()`.
+    epsilon_r: The permittivity distribution, see `system_matrix()`.
+    sources: The current sources, with shape `(num_sources,) + sim.shape`.
+
+  Returns:
+    The Ez fields, with shape `(num_sources,) + sim.shape`.
+  """
+  entries_a, indices_a = system_matrix(sim, epsilon_r)
+  b = np.stack([sim._grid_to_vec(source) for source in sources], axis=-1)
+  ez_vecs = primitives.sp_solve_multiple(entries_a, indices_a,
+                                         1j * sim.omega * b)
+  return npa.stack([
+      sim._vec_to_grid(ez_vecs[:, k]) for k in range(len(sources))
+  ])
+
+
+def h_fields(
+    sim: ceviche.fdfd_ez,
+    ez: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+  """The Hx and Hy fields of a simulation for its Ez field.
+
+  Args:
+    sim: The `ceviche.fdfd_ez` simulation, see `system_matrix()`.
+    ez: The Ez field, with the shape of the simulation grid.
+
+  Returns:
+    The Hx and Hy fields, with the shape of the simulation grid.
+  """
+  hx_vec, hy_vec = sim._Ez_to_Hx_Hy(sim._grid_to_vec(ez))
+  return sim._vec_to_grid(hx_vec), sim._vec_to_grid(hy_vec)
+
+
+# pylint: enable=protected-access
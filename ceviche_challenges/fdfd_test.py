@@ -0,0 +1,65 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for ceviche_challenges.fdfd."""
+
+from absl.testing import absltest
+import ceviche
+
+from ceviche_challenges import fdfd
+
+import numpy as np
+
+_OMEGA = 2 * np.pi * 200e12
+_DL = 25e-9
+_NPML = [10, 10]
+
+
+class FdfdTest(absltest.TestCase):
+
+  def test_solve_matches_ceviche(self):
+    """Test the fields against those of `ceviche.fdfd_ez.solve()`."""
+    rng = np.random.default_rng(0)
+    shape = (50, 40)
+    epsilon_r_bg = np.ones(shape)
+    epsilon_r = 1 + 11.25 * rng.uniform(size=shape)
+    sources = np.zeros((2,) + shape)
+    sources[0, 20, 10:30] = 1.0
+    sources[1, 12:38, 30] = rng.normal(size=(26,))
+
+    # The permittivity of the simulation is replaced by `epsilon_r`.
+    sim = ceviche.fdfd_ez(_OMEGA, _DL, epsilon_r_bg, _NPML)
+    ezs = fdfd.solve_ez(sim, epsilon_r, sources)
+    self.assertEqual(ezs.shape, sources.shape)
+
+    sim_ref = ceviche.fdfd_ez(_OMEGA, _DL, epsilon_r, _NPML)
+    for ez, source in zip(ezs, sources):
+      hx_ref, hy_ref, ez_ref = sim_ref.solve(source)
+      hx, hy = fdfd.h_fields(sim, ez)
+      for field, field_ref in ((ez, ez_ref), (hx, hx_ref), (hy, hy_ref)):
+        np.testing.assert_allclose(
+            field, field_ref, atol=1e-9 * np.max(np.abs(field_ref)))
+
+  def test_system_matrix(self):
+    """Test that the system matrix depends on the given permittivity."""
+    shape = (30, 20)
+    sim = ceviche.fdfd_ez(_OMEGA, _DL, np.ones(shape), _NPML)
+    entries, indices = fdfd.system_matrix(sim, np.ones(shape))
+    entries_2, indices_2 = fdfd.system_matrix(sim, 2 * np.ones(shape))
+    self.assertEqual(indices.shape, (2, entries.size))
+    np.testing.assert_array_equal(indices, indices_2)
+    self.assertFalse(np.array_equal(entries, entries_2))
+
+
+if __name__ == '__main__':
+  absltest.main()
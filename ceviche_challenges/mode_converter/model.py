@@ -41,14 +41,36 @@ class ModeConverterModel(model_base.Model):
       params: Parameters for the ceviche simulation.
       spec: Specification of the waveguide mode converter geometry.
     """
+    super().__init__()
     self.params = params
     self.spec = spec
-    extent_i, extent_j = spec.extent_ij(params.resolution)
-    self._shape = (
-        u.resolve(extent_i, params.resolution),
-        u.resolve(extent_j, params.resolution),
-    )
-    self._make_bg_density_and_ports()
+    self._extent_ij = spec.extent_ij(params.resolution)
+    extent_i, extent_j = self._extent_ij
+    size_i, size_j = spec.variable_region_size
+    shape_i, shape_j, wg_length, region_i, region_j, region_j_min = (
+        u.resolve_many(
+            (
+                extent_i,
+                extent_j,
+                spec.wg_length,
+                size_i,
+                size_j,
+                (extent_j - size_j) / 2,
+            ),
+            params.resolution,
+        ))
+    self._shape = (shape_i, shape_j)
+    x_min = spec.pml_width + wg_length
+    x_max = x_min + region_i
+    y_min = region_j_min
+    y_max = y_min + region_j
+    self._design_region_coords = (x_min, y_min, x_max, y_max)
+    self._dl = params.resolution.to_value('m')
+    self._output_wavelengths = u.Array(params.wavelengths).to_value(u.nm)
+    self._output_wavelengths.flags.writeable = False
+    # The background density and ports are built on first access.
+    self._density_bg = None
+    self._ports = None
 
   def _make_bg_density_and_ports(self, init_design_region: bool = False):
     """Initializes background density and ports for the model.
@@ -67,42 +89,62 @@ class ModeConverterModel(model_base.Model):
 
     density = np.zeros(self.shape)
 
-    monitor_offset = u.resolve(s.input_monitor_offset, p.resolution)
-
-    wg_center_y = s.extent_ij(p.resolution)[1] / 2
-    wg_extent = s.pml_width + u.resolve(s.wg_length, p.resolution)
-
-    wg_min_y_left = u.resolve(wg_center_y - s.left_wg_width / 2, p.resolution)
-    wg_max_y_left = u.resolve(wg_center_y + s.left_wg_width / 2, p.resolution)
-
-    density[:wg_extent, wg_min_y_left:wg_max_y_left] = 1.0
-
-    wg_min_y_right = u.resolve(wg_center_y - s.right_wg_width / 2, p.resolution)
-    wg_max_y_right = u.resolve(wg_center_y + s.right_wg_width / 2, p.resolution)
+    extent_i, extent_j = self._extent_ij
+    wg_center_y = extent_j / 2
+    (
+        monitor_offset,
+        wg_length,
+        wg_min_y_left,
+        wg_max_y_left,
+        wg_min_y_right,
+        wg_max_y_right,
+        port_pml_offset,
+        port_i_right,
+        port_j,
+        port_width_left,
+        port_width_right,
+    ) = u.resolve_many(
+        (
+            s.input_monitor_offset,
+            s.wg_length,
+            wg_center_y - s.left_wg_width / 2,
+            wg_center_y + s.left_wg_width / 2,
+            wg_center_y - s.right_wg_width / 2,
+            wg_center_y + s.right_wg_width / 2,
+            s.port_pml_offset,
+            extent_i - s.port_pml_offset,
+            wg_center_y,
+            s.left_wg_width + 2 * s.left_wg_mode_padding,
+            s.right_wg_width + 2 * s.right_wg_mode_padding,
+        ),
+        p.resolution,
+    )
+    wg_extent = s.pml_width + wg_length
 
-    density[-wg_extent - 1:, wg_min_y_right:wg_max_y_right] = 1.0
+    stripes = (
+        np.s_[:wg_extent, wg_min_y_left:wg_max_y_left],
+        np.s_[-wg_extent - 1:, wg_min_y_right:wg_max_y_right],
+    )
+    for stripe in stripes:
+      density[stripe] = 1.0
 
     port1 = modes.WaveguidePort(
-        x=s.pml_width + u.resolve(s.port_pml_offset, p.resolution),
-        y=u.resolve(wg_center_y, p.resolution),
-        width=u.resolve(s.left_wg_width + 2 * s.left_wg_mode_padding,
-                        p.resolution),
+        x=s.pml_width + port_pml_offset,
+        y=port_j,
+        width=port_width_left,
         order=s.left_wg_mode_order,
         dir=defs.Direction.X_POS,
         offset=monitor_offset)
     port2 = modes.WaveguidePort(
-        x=u.resolve(
-            s.extent_ij(p.resolution)[0] - s.port_pml_offset, p.resolution) -
-        s.pml_width,
-        y=u.resolve(wg_center_y, p.resolution),
-        width=u.resolve(s.right_wg_width + 2 * s.right_wg_mode_padding,
-                        p.resolution),
+        x=port_i_right - s.pml_width,
+        y=port_j,
+        width=port_width_right,
         order=s.right_wg_mode_order,
         dir=defs.Direction.X_NEG,
         offset=monitor_offset)
 
     if init_design_region:
-      density[self.design_region] = 1.0
+      density[self.design_region_slice] = 1.0
 
     self._density_bg = density
     self._ports = [port1, port2]
@@ -110,16 +152,7 @@ class ModeConverterModel(model_base.Model):
   @property
   def design_region_coords(self) -> Tuple[int, int, int, int]:
     """The coordinates of the design region as (x_min, y_min, x_max, y_max)."""
-    s = self.spec
-    p = self.params
-    x_min = s.pml_width + u.resolve(s.wg_length, p.resolution)
-    x_max = x_min + u.resolve(s.variable_region_size[0], p.resolution)
-    y_min = u.resolve(
-        (s.extent_ij(p.resolution)[1] - s.variable_region_size[1]) / 2,
-        p.resolution,
-    )
-    y_max = y_min + u.resolve(s.variable_region_size[1], p.resolution)
-    return (x_min, y_min, x_max, y_max)
+    return self._design_region_coords
 
   @property
   def shape(self) -> Tuple[int, int]:
@@ -129,6 +162,8 @@ class ModeConverterModel(model_base.Model):
   @property
   def density_bg(self) -> np.ndarray:
     """The background density distribution of the model."""
+    if self._density_bg is None:
+      self._make_bg_density_and_ports()
     return self._density_bg
 
   @property
@@ -146,8 +181,7 @@ class ModeConverterModel(model_base.Model):
   @property
   def dl(self) -> float:
     """The grid resolution of the model."""
-    p = self.params
-    return p.resolution.to_value('m')
+    return self._dl
 
   @property
   def pml_width(self) -> int:
@@ -158,9 +192,11 @@ class ModeConverterModel(model_base.Model):
   @property
   def ports(self) -> List[modes.Port]:
     """A list of the device ports."""
+    if self._ports is None:
+      self._make_bg_density_and_ports()
     return self._ports
 
   @property
   def output_wavelengths(self) -> List[float]:
     """A list of the wavelengths, in nm, to output fields and s-parameters."""
-    return u.Array(self.params.wavelengths).to_value(u.nm)
+    return self._output_wavelengths
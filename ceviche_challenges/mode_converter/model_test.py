@@ -25,6 +25,19 @@ from absl.testing import parameterized
 _ATOL_SCATTERING_PARAMETERS = 1e-2
 
 
+class ModelTest(absltest.TestCase):
+
+  def test_epsilon_r_bg_is_double_precision(self):
+    """Test that the background permittivity is not rounded to single precision."""
+    slab_permittivity = 3.48**2
+    params = prefabs.mode_converter_sim_params()
+    spec = prefabs.mode_converter_spec_12(slab_permittivity=slab_permittivity)
+    model = _model.ModeConverterModel(params, spec)
+    epsilon_r_bg = model.epsilon_r_bg()
+    self.assertEqual(epsilon_r_bg.dtype, np.float64)
+    self.assertEqual(epsilon_r_bg.max(), slab_permittivity)
+
+
 class ModelScatteringTest(parameterized.TestCase):
 
   @parameterized.named_parameters(
@@ -75,10 +88,11 @@ class ModelScatteringTest(parameterized.TestCase):
         excite_port_idxs=(0, 1),
     )
     s = np.abs(s_params.squeeze())
-    # Check overall scattering matrix symmetry
+    # For a two port device the diagonal of the scattering matrix is trivially
+    # symmetric, so only the transmission terms need to be compared.
     np.testing.assert_allclose(
-        s,
-        s.T,
+        s[0, 1],
+        s[1, 0],
         atol=_ATOL_SCATTERING_PARAMETERS,
     )
 
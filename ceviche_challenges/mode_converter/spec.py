@@ -38,8 +38,6 @@ from typing import Sequence, Tuple
 
 from ceviche_challenges import units as u
 
-import numpy as np
-
 Q = u.Quantity  # pylint: disable=invalid-name
 QSequence = Sequence[Q]  # pylint: disable=invalid-name
 
@@ -111,10 +109,10 @@ class ModeConverterSpec:
     pml_thickness = self.pml_width * resolution
     left_port_height = self.left_wg_width + 2 * self.left_wg_mode_padding
     right_port_height = self.right_wg_width + 2 * self.right_wg_mode_padding
-    largest_port_height = np.maximum(left_port_height, right_port_height)
+    largest_port_height = max(left_port_height, right_port_height)
     padded_design_height = vj + 2 * self.padding
     extent_i = 2 * pml_thickness + 2 * self.wg_length + vi
-    extent_j = 2 * pml_thickness + np.maximum(
+    extent_j = 2 * pml_thickness + max(
         padded_design_height,
         largest_port_height,
     )
@@ -14,13 +14,16 @@
 """The base model for planar devices in ceviche with a single design region."""
 
 import abc
+import collections
 import concurrent.futures
-import itertools
-from typing import Tuple, Optional, List, Sequence
+import functools
+import threading
+from typing import Dict, Iterator, Tuple, Optional, List, Sequence
 
 import autograd.numpy as npa
 import ceviche
 
+from ceviche_challenges import fdfd
 from ceviche_challenges import modes
 from ceviche_challenges import primitives
 from ceviche_challenges import units as u
@@ -29,11 +32,57 @@ from ceviche_challenges.scattering import calculate_amplitudes
 import numpy as np
 
 
+# The maximum number of frequencies for which a model keeps its FDFD simulation
+# and port sources. Sweeps over more frequencies rebuild them as needed.
+_OMEGA_CACHE_SIZE = 16
+
+# Guards the per-frequency caches of all models, which are accessed by the
+# simulation threads of `Model.simulate()`.
+_OMEGA_CACHE_LOCK = threading.Lock()
+
+
 def _wavelengths_nm_to_omegas(wavelengths_nm: np.ndarray) -> np.ndarray:
   """Convert array of wavelengths to array of angular frequencies for ceviche."""
   return 2 * np.pi * u.c.to_value('nm/s') / wavelengths_nm
 
 
+def _collect_results(
+    results: Iterator[Tuple[np.ndarray, np.ndarray]],
+    num_results: int,
+    traced: bool,
+) -> Tuple[np.ndarray, np.ndarray]:
+  """Collects the s-parameters and fields of the simulations of a model.
+
+  Each result holds the outputs of all excitation ports of an omega, so the
+  outputs are stacked by omega and then by excitation port. Outside of autograd
+  tracing, the results are copied into preallocated arrays as they arrive, so
+  that each result is released before the next one, rather than holding all of
+  them until they are stacked.
+
+  Args:
+    results: An iterator over the `(s-parameters, fields)` results of the
+      simulations, in the order of the omegas.
+    num_results: The number of results.
+    traced: Whether the results are traced by autograd, which requires them to
+      be stacked.
+
+  Returns:
+    A tuple of the stacked s-parameters and fields.
+  """
+  if traced:
+    results = list(results)
+    return (npa.stack([sps for sps, _ in results]),
+            npa.stack([ez for _, ez in results]))
+  sparams = efields = None
+  for i, (sps, ez) in enumerate(results):
+    if sparams is None:
+      sparams = np.empty((num_results,) + sps.shape, dtype=sps.dtype)
+      efields = np.empty((num_results,) + ez.shape, dtype=ez.dtype)
+    sparams[i] = sps
+    efields[i] = ez
+  return sparams, efields
+
+
 class Model(abc.ABC):
   """The base class for planar devices in ceviche with a single design region.
 
@@ -83,8 +132,24 @@ class Model(abc.ABC):
   FIELDS_OUTPUT_PORT_AXIS = -2  # pylint: disable=invalid-name
 
   def __init__(self):
-    """Initializes a new model."""
-    pass
+    """Initializes a new model.
+
+    The caches of the model are also created on first use, so subclasses that
+    do not call this initializer remain supported.
+    """
+    # The FDFD simulation and the modal sources of the ports, by angular
+    # frequency, for the most recently simulated frequencies. Constructing a
+    # simulation builds its (PML-stretched) derivative operators, which only
+    # depend on the frequency, grid, and PML of the model. The sources only
+    # depend on the background permittivity, so they are shared by all
+    # simulations of the model, regardless of design variable.
+    self._omega_cache = collections.OrderedDict()
+    # The inputs that the cached sources and simulations were built for, as a
+    # tuple of (epsilon_r_bg, dl, pml_width, ports).
+    self._cache_inputs = None
+    # The design region mask, with the shape and design region coordinates it
+    # was built for.
+    self._design_region = None
 
   def simulate(
       self,
@@ -105,9 +170,9 @@ class Model(abc.ABC):
         rank-1. If None, the resulting simulation will be as if the user had
         passed `self.output_wavelengths`--a rank-1 array.
       max_parallelizm: Maximum number of parallel threads executing simulations.
-        Parallelizm is applied across excitation ports and wavelengths. If None,
-        we set the number of workers to number of excitation ports times the
-        number of wavelengths.
+        Parallelizm is applied across wavelengths, as all excitation ports of a
+        wavelength are simulated together. If None, we set the number of
+        workers to the number of wavelengths.
 
     Returns:
       s_params: A complex-valued `np.ndarray` of shape `wavelengths_nm.shape +
@@ -117,18 +182,20 @@ class Model(abc.ABC):
         len(excite_port_idxs) + ez.shape`,  containing the steady-state Ez field
         per frequency.
     """
-    if np.max(excite_port_idxs) > len(self.ports) - 1:
+    # The port indices are a short sequence, so they are validated with Python
+    # builtins rather than by converting them to arrays.
+    if max(excite_port_idxs) > len(self.ports) - 1:
       raise ValueError('Invalid port index, {}, which exceeds the number of '
                        'ports in the device, {}.'.format(
-                           np.max(excite_port_idxs),
+                           max(excite_port_idxs),
                            len(self.ports),
                        ))
-    if np.min(excite_port_idxs) < 0:
+    if min(excite_port_idxs) < 0:
       raise ValueError('Invalid port index, {}, which below the minimum port '
-                       'index of 0.'.format(np.min(excite_port_idxs),))
-    if len(np.unique(excite_port_idxs)) != len(excite_port_idxs):
+                       'index of 0.'.format(min(excite_port_idxs),))
+    if len(set(excite_port_idxs)) != len(excite_port_idxs):
       raise ValueError('Duplicate port index specified in `excite_port_idxs`.')
-    if not np.all(np.sort(excite_port_idxs) == np.asarray(excite_port_idxs)):
+    if any(a > b for a, b in zip(excite_port_idxs, excite_port_idxs[1:])):
       raise ValueError('Ports specified in `excite_port_idxs` are not sorted.')
 
     if wavelengths_nm is None:
@@ -140,43 +207,91 @@ class Model(abc.ABC):
 
     omegas = _wavelengths_nm_to_omegas(wavelengths_nm)
 
-    pml_width = self.pml_width
-    dl = self.dl
-    epsilon_r = self.epsilon_r(design_variable)
-
     # We use the background epsilon_r for the modal functions because we do not
     # want autograd to attempt to track gradients through the eigensolver. Such
     # tracking would likely fail as the eigensolver is not differentiable.
     # Moreover, the modal sources should be located well away from the design
     # region.
     epsilon_r_bg = self.epsilon_r_bg()
+    self._invalidate_stale_caches(epsilon_r_bg)
+
+    # The permittivity is computed once and shared by all of the simulations
+    # below. Outside of autograd tracing it is a fresh float64 array, which is
+    # made read-only so that no simulation can modify it for the others.
+    epsilon_r = self._insert_design_epsilon_r(design_variable, epsilon_r_bg)
+    if isinstance(epsilon_r, np.ndarray):
+      epsilon_r.flags.writeable = False
 
-    num_excite_ports = len(excite_port_idxs)
     flat_omegas = list(omegas.ravel(order='C'))
-    num_omegas = len(flat_omegas)
-    sparams = [[None] * num_omegas for _ in range(num_excite_ports)]
-    efields = [[None] * num_omegas for _ in range(num_excite_ports)]
-
-    def _simulate(excite_port_idx_and_omega):
-      excite_port_idx, omega = excite_port_idx_and_omega
-
-      sim = ceviche.fdfd_ez(
-          omega,
-          dl,
-          epsilon_r_bg,
-          [pml_width, pml_width],
-      )
-      sim.eps_r = epsilon_r
-      source = self.ports[excite_port_idx].source_fdfd(
-          omega,
-          dl,
-          epsilon_r_bg,
-      )
-      hx, hy, ez = sim.solve(source)
 
-      sm = []
+    # Run simulations in parallel across omegas. All excitation ports of an
+    # omega share the same FDFD system, which is therefore solved for all of
+    # their sources at once.
+    num_workers = max_parallelizm
+    if not num_workers:
+      num_workers = len(flat_omegas)
+    simulate_omega = functools.partial(
+        self._simulate_omega,
+        excite_port_idxs=excite_port_idxs,
+        epsilon_r=epsilon_r,
+        epsilon_r_bg=epsilon_r_bg,
+    )
+    traced = not isinstance(epsilon_r, np.ndarray)
+    if num_workers == 1:
+      # A single worker gains nothing from a thread pool, so the simulations
+      # are run directly in the calling thread.
+      sparams, efields = _collect_results(
+          map(simulate_omega, flat_omegas), len(flat_omegas), traced)
+    else:
+      with concurrent.futures.ThreadPoolExecutor(
+          max_workers=num_workers) as executor:
+        sparams, efields = _collect_results(
+            executor.map(simulate_omega, flat_omegas), len(flat_omegas), traced)
+
+    # Move the excitation port axis into place for output
+    sparams = npa.moveaxis(sparams, 1, self.SPARAMS_INPUT_PORT_AXIS)
+    efields = npa.moveaxis(efields, 1, self.FIELDS_INPUT_PORT_AXIS)
+    return sparams, efields
+
+  def _simulate_omega(
+      self,
+      omega: float,
+      excite_port_idxs: Sequence[int],
+      epsilon_r: np.ndarray,
+      epsilon_r_bg: np.ndarray,
+  ) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulates the model for several excitation ports at a single frequency.
+
+    Args:
+      omega: The angular frequency of the simulation.
+      excite_port_idxs: The indices of the ports to excite.
+      epsilon_r: The permittivity distribution to simulate.
+      epsilon_r_bg: The background permittivity distribution, used for the
+        modal sources and for the mode decomposition at the ports.
+
+    Returns:
+      A tuple of the scattering parameters into every port, with shape
+      `(len(excite_port_idxs), len(self.ports))`, and the Ez fields, with shape
+      `(len(excite_port_idxs),) + self.shape`.
+    """
+    dl = self.dl
+
+    # The fields of all excitation ports are solved with a single factorization
+    # of the system matrix of the cached simulation.
+    sim = self._fdfd_sim(omega, epsilon_r_bg)
+    sources = np.stack([
+        self._port_source(port_idx, omega, epsilon_r_bg)
+        for port_idx in excite_port_idxs
+    ])
+    ezs = fdfd.solve_ez(sim, epsilon_r, sources)
+
+    sparams = []
+    for ez, excite_port_idx in zip(ezs, excite_port_idxs):
+      hx, hy = fdfd.h_fields(sim, ez)
+
       sp = []
-      for j, port in enumerate(self.ports):
+      sm = []
+      for port in self.ports:
         a, b = calculate_amplitudes(
             omega,
             dl,
@@ -186,35 +301,141 @@ class Model(abc.ABC):
             hx,
             epsilon_r_bg,
         )
-        if j == excite_port_idx:
-          sp = a
+        sp.append(a)
         sm.append(b)
-      return excite_port_idx, omega, [smi / sp for smi in sm], ez
+      sparams.append(npa.stack(sm) / sp[excite_port_idx])
+    return npa.stack(sparams), ezs
 
-    # Run simulations in parallel across excitation ports and omegas.
-    num_workers = max_parallelizm
-    if not num_workers:
-      num_workers = num_excite_ports * num_omegas
-    with concurrent.futures.ThreadPoolExecutor(
-        max_workers=num_workers) as executor:
-      simute_results = list(
-          executor.map(_simulate,
-                       itertools.product(excite_port_idxs, flat_omegas)))
-
-    # Collect results from multiple threads.
-    for port, omega, sps, ez in simute_results:
-      port_idx = excite_port_idxs.index(port)
-      omega_idx = flat_omegas.index(omega)
-      sparams[port_idx][omega_idx] = sps
-      efields[port_idx][omega_idx] = ez
-
-    # Stack into arrays and reshape for output
-    sparams = npa.stack(sparams, axis=self.SPARAMS_INPUT_PORT_AXIS)
-    efields = npa.stack(efields, axis=self.FIELDS_INPUT_PORT_AXIS)
-    return sparams, efields
+  def _invalidate_stale_caches(self, epsilon_r_bg: np.ndarray):
+    """Clears the cached sources and simulations if their inputs changed.
+
+    Args:
+      epsilon_r_bg: The background permittivity distribution of the upcoming
+        simulations.
+    """
+    dl = self.dl
+    pml_width = self.pml_width
+    ports = self.ports
+    cache_inputs = getattr(self, '_cache_inputs', None)
+    if cache_inputs is not None:
+      cached_epsilon_r_bg, cached_dl, cached_pml_width, cached_ports = (
+          cache_inputs)
+      if (cached_dl == dl and cached_pml_width == pml_width and
+          cached_ports is ports and
+          np.array_equal(cached_epsilon_r_bg, epsilon_r_bg)):
+        return
+    with _OMEGA_CACHE_LOCK:
+      self._omega_cache = collections.OrderedDict()
+    self._cache_inputs = (epsilon_r_bg, dl, pml_width, ports)
+
+  def _omega_cache_entry(
+      self,
+      omega: float,
+      epsilon_r_bg: np.ndarray,
+  ) -> Tuple[ceviche.fdfd_ez, Dict[int, np.ndarray]]:
+    """The cached FDFD simulation and port sources of the model at `omega`.
+
+    The entry is created on first use, and the least recently used entry is
+    evicted once more than `_OMEGA_CACHE_SIZE` frequencies are cached.
+
+    Args:
+      omega: The angular frequency of the simulation.
+      epsilon_r_bg: The background permittivity distribution of the model.
+
+    Returns:
+      A tuple of the FDFD simulation and a dict of the modal sources of the
+      ports, by port index, at `omega`.
+    """
+    with _OMEGA_CACHE_LOCK:
+      cache = getattr(self, '_omega_cache', None)
+      if cache is None:
+        cache = collections.OrderedDict()
+        self._omega_cache = cache
+      entry = cache.get(omega)
+      if entry is not None:
+        cache.move_to_end(omega)
+        return entry
+    sim = ceviche.fdfd_ez(
+        omega,
+        self.dl,
+        epsilon_r_bg,
+        [self.pml_width, self.pml_width],
+    )
+    with _OMEGA_CACHE_LOCK:
+      entry = cache.setdefault(omega, (sim, {}))
+      while len(cache) > _OMEGA_CACHE_SIZE:
+        cache.popitem(last=False)
+    return entry
+
+  def _fdfd_sim(
+      self,
+      omega: float,
+      epsilon_r_bg: np.ndarray,
+  ) -> ceviche.fdfd_ez:
+    """The FDFD simulation of the model, constructed once per frequency."""
+    sim, _ = self._omega_cache_entry(omega, epsilon_r_bg)
+    return sim
+
+  def _port_source(
+      self,
+      port_idx: int,
+      omega: float,
+      epsilon_r_bg: np.ndarray,
+  ) -> np.ndarray:
+    """The modal source of a port, computed once per port and frequency.
+
+    The returned source is shared by all simulations of the model and is
+    therefore read-only.
+    """
+    _, sources = self._omega_cache_entry(omega, epsilon_r_bg)
+    source = sources.get(port_idx)
+    if source is None:
+      source = self.ports[port_idx].source_fdfd(omega, self.dl, epsilon_r_bg)
+      source.flags.writeable = False
+      sources[port_idx] = source
+    return source
 
   def density(self, design_variable: np.ndarray) -> np.ndarray:
     """The combined (design + background) density distribution of the model."""
+    self._check_design_variable_shape(design_variable)
+    return primitives.insert_design_variable(
+        self.transform_design_variable(design_variable),
+        self.density_bg,
+        self.design_region_coords,
+    )
+
+  def epsilon_r(self, design_variable: np.ndarray) -> np.ndarray:
+    """The combined permittivity distribution of the model."""
+    return self._insert_design_epsilon_r(design_variable, self.epsilon_r_bg())
+
+  def _insert_design_epsilon_r(
+      self,
+      design_variable: np.ndarray,
+      epsilon_r_bg: np.ndarray,
+  ) -> np.ndarray:
+    """Inserts the permittivity of the design into the background permittivity.
+
+    Only the design region is mapped from density to permittivity, while the
+    rest of the domain is copied from the background permittivity, which is
+    equal to the permittivity of the combined density outside of the design
+    region.
+
+    Args:
+      design_variable: `np.ndarray` specifying the topology of the design.
+      epsilon_r_bg: The background permittivity distribution of the model.
+
+    Returns:
+      The combined permittivity distribution of the model.
+    """
+    self._check_design_variable_shape(design_variable)
+    return primitives.insert_design_variable(
+        self._epsilon_r(self.transform_design_variable(design_variable)),
+        epsilon_r_bg,
+        self.design_region_coords,
+    )
+
+  def _check_design_variable_shape(self, design_variable: np.ndarray):
+    """Raises a `ValueError` if the design variable has an invalid shape."""
     if design_variable.shape != self.design_variable_shape:
       raise ValueError(
           'Invalid design variable shape. Got ({}, {},) but expected ({}, {},)'
@@ -224,15 +445,6 @@ class Model(abc.ABC):
               self.design_variable_shape[0],
               self.design_variable_shape[1],
           ))
-    return primitives.insert_design_variable(
-        self.transform_design_variable(design_variable),
-        self.density_bg,
-        self.design_region_coords,
-    )
-
-  def epsilon_r(self, design_variable: np.ndarray) -> np.ndarray:
-    """The combined permittivity distribution of the model."""
-    return self._epsilon_r(self.density(design_variable))
 
   def epsilon_r_bg(self) -> np.ndarray:
     """The background permittivity distribution of the model."""
@@ -240,6 +452,17 @@ class Model(abc.ABC):
 
   def _epsilon_r(self, density: np.ndarray) -> np.ndarray:
     """Helper function for mapping density values to permittivity values."""
+    if isinstance(density, np.ndarray):
+      # Plain arrays are mapped in a single buffer, which is always double
+      # precision, even for backgrounds stored in single precision. Densities
+      # traced by autograd take the expression below instead.
+      epsilon_r = np.multiply(
+          density,
+          self.slab_permittivity - self.cladding_permittivity,
+          dtype=np.float64,
+      )
+      epsilon_r += self.cladding_permittivity
+      return epsilon_r
     return self.cladding_permittivity + (self.slab_permittivity -
                                          self.cladding_permittivity) * density
 
@@ -264,11 +487,27 @@ class Model(abc.ABC):
 
   @property
   def design_region(self) -> np.ndarray:
-    """A boolean mask for the design region."""
+    """A boolean mask for the design region.
+
+    Since the design region is rectangular, `design_region_slice` should be
+    preferred for indexing into arrays with the shape of the model. The mask is
+    built once for the geometry of the model and is read-only.
+    """
+    key = (self.shape, self.design_region_coords)
+    design_region = getattr(self, '_design_region', None)
+    if design_region is None or design_region[0] != key:
+      mask = np.zeros(self.shape, dtype=bool)
+      mask[self.design_region_slice] = True
+      mask.flags.writeable = False
+      design_region = (key, mask)
+      self._design_region = design_region
+    return design_region[1]
+
+  @property
+  def design_region_slice(self) -> Tuple[slice, slice]:
+    """A tuple of slices for indexing the design region."""
     x0, y0, x1, y1 = self.design_region_coords
-    mask = np.zeros(self.shape, dtype=bool)
-    mask[x0:x1, y0:y1] = True
-    return mask
+    return (slice(x0, x1), slice(y0, y1))
 
   @property
   def design_variable_shape(self) -> Tuple[int, int]:
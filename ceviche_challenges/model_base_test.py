@@ -0,0 +1,108 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for ceviche_challenges.model_base."""
+
+from unittest import mock
+
+from absl.testing import absltest
+
+from ceviche_challenges import model_base
+from ceviche_challenges import units as u
+from ceviche_challenges.beam_splitter import model as beam_splitter_model
+from ceviche_challenges.beam_splitter import prefabs as beam_splitter_prefabs
+from ceviche_challenges.mode_converter import model as mode_converter_model
+from ceviche_challenges.mode_converter import prefabs as mode_converter_prefabs
+from ceviche_challenges.waveguide_bend import model as _model
+from ceviche_challenges.waveguide_bend import prefabs
+from ceviche_challenges.wdm import model as wdm_model
+from ceviche_challenges.wdm import prefabs as wdm_prefabs
+
+import numpy as np
+
+_WAVELENGTHS_NM = (1250., 1270., 1290.)
+
+
+class _NoBaseInitModel(_model.WaveguideBendModel):
+  """A waveguide bend that does not call the initializer of `Model`."""
+
+  def __init__(self, params, spec):  # pylint: disable=super-init-not-called
+    self.params = params
+    self.spec = spec
+    extent_i, extent_j = spec.extent_ij(params.resolution)
+    self._shape = (
+        u.resolve(extent_i, params.resolution),
+        u.resolve(extent_j, params.resolution),
+    )
+    self._make_bg_density_and_ports()
+
+
+class ModelCacheTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.params = prefabs.waveguide_bend_sim_params(resolution=50 * u.nm)
+    self.spec = prefabs.waveguide_bend_1umx1um_spec()
+
+  def simulate(self, model):
+    design_var = np.ones(model.design_variable_shape)
+    return model.simulate(
+        design_var,
+        excite_port_idxs=(0, 1),
+        wavelengths_nm=_WAVELENGTHS_NM,
+    )
+
+  def test_subclass_without_base_init(self):
+    """Test a model whose initializer does not call `Model.__init__()`."""
+    s_params, fields = self.simulate(_NoBaseInitModel(self.params, self.spec))
+    s_params_ref, fields_ref = self.simulate(
+        _model.WaveguideBendModel(self.params, self.spec))
+    np.testing.assert_array_equal(s_params, s_params_ref)
+    np.testing.assert_array_equal(fields, fields_ref)
+
+  def test_omega_cache_is_bounded(self):
+    """Test that a model only caches the most recent frequencies."""
+    s_params_ref, fields_ref = self.simulate(
+        _model.WaveguideBendModel(self.params, self.spec))
+    m = _model.WaveguideBendModel(self.params, self.spec)
+    with mock.patch.object(model_base, '_OMEGA_CACHE_SIZE', 2):
+      s_params, fields = self.simulate(m)
+      self.assertLen(m._omega_cache, 2)  # pylint: disable=protected-access
+      # A repeated simulation rebuilds the evicted frequency.
+      s_params_new, fields_new = self.simulate(m)
+      self.assertLen(m._omega_cache, 2)  # pylint: disable=protected-access
+    np.testing.assert_array_equal(s_params, s_params_ref)
+    np.testing.assert_array_equal(fields, fields_ref)
+    np.testing.assert_array_equal(s_params_new, s_params_ref)
+    np.testing.assert_array_equal(fields_new, fields_ref)
+
+  def test_models_accept_attributes(self):
+    """Test that attributes can be attached to the models of this package."""
+    models = [
+        _model.WaveguideBendModel(self.params, self.spec),
+        beam_splitter_model.BeamSplitterModel(
+            beam_splitter_prefabs.pico_splitter_sim_params(),
+            beam_splitter_prefabs.pico_splitter_spec()),
+        mode_converter_model.ModeConverterModel(
+            mode_converter_prefabs.mode_converter_sim_params(),
+            mode_converter_prefabs.mode_converter_spec_12()),
+        wdm_model.WdmModel(wdm_prefabs.wdm_sim_params(),
+                           wdm_prefabs.wdm_spec()),
+    ]
+    for m in models:
+      m.label = type(m).__name__
+      self.assertEqual(m.label, type(m).__name__)
+
+
+if __name__ == '__main__':
+  absltest.main()
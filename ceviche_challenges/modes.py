@@ -49,6 +49,7 @@ we limit ourselves to the polarization with E along the z-direction (out of the
 """
 
 import dataclasses
+import functools
 from typing import Tuple
 
 from ceviche import constants
@@ -87,19 +88,12 @@ class Port:
           'Odd values for the port width are currently not supported')
 
   def coords(self) -> defs.Slice:
-    """Generate coordinate vectors for slicing in/out of 2D arrays."""
-    # pylint:disable=g-bad-todo
-    # TODO: correctly handle an odd width value, rather than round off
-    if self.dir.is_along_x:
-      x_coords = np.ones((self.width,), dtype=int) * self.x
-      y_coords = np.arange(
-          self.y - self.width // 2, self.y + self.width // 2, dtype=int)
-    else:
-      y_coords = np.ones((self.width,), dtype=int) * self.y
-      x_coords = np.arange(
-          self.x - self.width // 2, self.x + self.width // 2, dtype=int)
+    """Generate coordinate vectors for slicing in/out of 2D arrays.
 
-    return (x_coords, y_coords)
+    The coordinate vectors are shared by all ports with the same geometry, and
+    are therefore read-only.
+    """
+    return _port_coords(self.x, self.y, self.width, self.dir.is_along_x)
 
   def source_fdfd(
       self,
@@ -176,8 +170,107 @@ class WaveguidePort(Port):
   order: int
 
   def field_profiles(self, epsilon_r: defs.Geometry, omega: float, dl: float):
-    """Computes electric and magnetic field profile of the waveguide mode."""
-    return solve_modes(epsilon_r, omega, dl, self.order)
+    """Computes electric and magnetic field profile of the waveguide mode.
+
+    The mode only depends on the permittivity of the slice, the frequency, the
+    grid cell size, and the order, so it is solved once for each of them. The
+    returned field profiles are shared, and therefore read-only.
+    """
+    epsilon_r = np.asarray(epsilon_r)
+    return _solve_modes_cached(
+        epsilon_r.tobytes(),
+        epsilon_r.dtype.str,
+        epsilon_r.shape,
+        omega,
+        dl,
+        self.order,
+    )
+
+
+# Relative margin by which the shift of the eigenmode solver exceeds the upper
+# bound of the eigenvalues, such that the shifted operator is never singular.
+_SHIFT_MARGIN = 1e-3
+
+# Largest mode slice, in pixels, for which the eigenmodes are solved with a
+# dense rather than an iterative eigensolver.
+_DENSE_SOLVER_MAX_SIZE = 128
+
+
+# Maximum number of waveguide modes kept by `WaveguidePort.field_profiles()`.
+_MODE_CACHE_SIZE = 1024
+
+# Maximum number of port slices kept by `Port.coords()`, and of slice sizes
+# kept by `_second_derivative()`.
+_SLICE_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=_MODE_CACHE_SIZE)
+def _solve_modes_cached(
+    epsilon_r_bytes: bytes,
+    dtype: str,
+    shape: Tuple[int, ...],
+    omega: float,
+    dl: float,
+    order: int,
+) -> Tuple[defs.Field, defs.Field, float]:
+  """Solves a mode, see `solve_modes()`, for a hashable slice permittivity."""
+  epsilon_r = np.frombuffer(epsilon_r_bytes, dtype=dtype).reshape(shape)
+  e, h, beta = solve_modes(epsilon_r, omega, dl, order)
+  e.flags.writeable = False
+  h.flags.writeable = False
+  return e, h, beta
+
+
+@functools.lru_cache(maxsize=_SLICE_CACHE_SIZE)
+def _port_coords(x: int, y: int, width: int, is_along_x: bool) -> defs.Slice:
+  """Coordinate vectors of a port slice, see `Port.coords()`."""
+  # pylint:disable=g-bad-todo
+  # TODO: correctly handle an odd width value, rather than round off
+  if is_along_x:
+    x_coords = np.full((width,), x, dtype=int)
+    y_coords = np.arange(y - width // 2, y + width // 2, dtype=int)
+  else:
+    y_coords = np.full((width,), y, dtype=int)
+    x_coords = np.arange(x - width // 2, x + width // 2, dtype=int)
+  x_coords.flags.writeable = False
+  y_coords.flags.writeable = False
+  return (x_coords, y_coords)
+
+
+@functools.lru_cache(maxsize=_SLICE_CACHE_SIZE)
+def _second_derivative(
+    size: int,
+    dl: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+  """The second derivative operator of the eigenmode solver, in CSR parts.
+
+  The mode slice has no PML, so the operator is real, symmetric, and does not
+  depend on the angular frequency. It is shared by the modes of all frequencies
+  and ports, and is returned in the sparsity pattern that adding a diagonal to
+  it produces, so that the eigenmode operator can be assembled by adding to its
+  diagonal entries directly.
+
+  Args:
+    size: `int` specifying the number of pixels in the slice.
+    dl: `float` specifying the spatial grid cell size, in units of meters.
+
+  Returns:
+    The CSR `data`, `indices` and `indptr` arrays of the operator, and the
+    positions of its diagonal entries in `data`, ordered by row. The arrays are
+    shared, and must not be modified.
+  """
+  # Without PML, the angular frequency does not enter the derivative matrices.
+  dxf, dxb, _, _ = derivatives.compute_derivative_matrices(
+      1.0, (size, 1), [0, 0], dL=dl)
+  laplacian = dxf.dot(dxb)
+  pattern = laplacian + scipy.sparse.identity(size, format='csr')
+  rows = np.repeat(np.arange(size), np.diff(pattern.indptr))
+  data = np.asarray(laplacian[rows, pattern.indices]).ravel().real
+  diagonal = np.flatnonzero(rows == pattern.indices)
+  parts = (data, pattern.indices, pattern.indptr, diagonal)
+  for part in parts:
+    part.flags.writeable = False
+  return parts
 
 
 def solve_modes(
@@ -200,15 +293,18 @@ def solve_modes(
 
   Returns:
     The electric field, the magnetic field, and the real part of the mode
-    wave vector.
+    wave vector. The fields are real valued and in phase, with the sign chosen
+    such that the first lobe of the mode is negative.
   """
   k0 = omega / constants.C_0
 
-  dxf, dxb, _, _ = derivatives.compute_derivative_matrices(
-      omega, (epsilon_r.size, 1), [0, 0], dL=dl)
-
-  diag_eps_r = scipy.sparse.spdiags(epsilon_r.ravel(), [0], epsilon_r.size,
-                                    epsilon_r.size)
+  data, indices, indptr, diagonal = _second_derivative(epsilon_r.size, dl)
+  data = data.copy()
+  data[diagonal] += k0**2 * epsilon_r.ravel()
+  operator = scipy.sparse.csr_matrix(
+      (data, indices, indptr),
+      shape=(epsilon_r.size, epsilon_r.size),
+  )
 
   # Solves the eigenvalue problem:
   #
@@ -216,17 +312,40 @@ def solve_modes(
   #
   # where E is the transverse electric field component of the eigenmode and β²
   # is the eigenvalue. β corresponds to the guided wavevector of the eigenmode.
-  vals, vecs = scipy.sparse.linalg.eigs(
-      dxf.dot(dxb) + k0**2 * diag_eps_r,
-      k=order,
-      v0=epsilon_r.ravel(),
-      which='LR')
-
-  # Sort the eigenmodes because apparently scipy does not guarantee this
-  betas = np.real(np.sqrt(vals, dtype=complex))
-  inds_sorted = np.argsort(betas)
-  e = vecs[:, inds_sorted[0]]
-  beta = betas[inds_sorted[0]]
+  # The operator is real and symmetric, so the symmetric (Lanczos) eigensolver
+  # is used. Since ∂²/∂x² is negative semi-definite, no eigenvalue exceeds
+  # max(εr) k₀², and the largest eigenvalues are found in shift-invert mode as
+  # those nearest to a shift just above that bound. For narrow slices, the
+  # fixed overhead of the iterative solver exceeds the cost of a direct dense
+  # solve for the same eigenpairs.
+  n = epsilon_r.size
+  if n <= _DENSE_SOLVER_MAX_SIZE:
+    vals, vecs = scipy.linalg.eigh(
+        operator.toarray(),
+        subset_by_index=(n - order, n - 1),
+    )
+  else:
+    sigma = (1 + _SHIFT_MARGIN) * k0**2 * np.max(epsilon_r)
+    vals, vecs = scipy.sparse.linalg.eigsh(
+        operator,
+        k=order,
+        sigma=sigma,
+        v0=epsilon_r.ravel(),
+        which='LM')
+
+  # The eigensolvers return the `order` largest eigenvalues, but do not
+  # guarantee their ordering. The mode of the requested order has the smallest
+  # of them. The eigenvalues of the symmetric operator are real, and only the
+  # real part of β is kept, which is zero for a negative eigenvalue.
+  ind = np.argmin(vals)
+  e = vecs[:, ind]
+  beta = np.sqrt(np.maximum(vals[ind], 0.0))
+
+  # The sign of the eigenmode is arbitrary and depends on the eigensolver. It is
+  # fixed such that the first lobe of the mode, i.e. its first value with at
+  # least half of the peak magnitude, is negative.
+  first_lobe = np.argmax(np.abs(e) >= 0.5 * np.max(np.abs(e)))
+  e = -np.sign(e[first_lobe]) * e.astype(complex)
 
   # Compute transverse magnetic field as:
   #
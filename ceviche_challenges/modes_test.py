@@ -13,6 +13,8 @@
 # limitations under the License.
 """Tests for ceviche_challenges.modes."""
 
+from unittest import mock
+
 from absl.testing import absltest
 from ceviche import constants
 
@@ -118,6 +120,74 @@ class ModesTest(absltest.TestCase):
     # light line, meaning that beta4 / k0 < 1.0
     self.assertLess(beta4 / k0, 1.)
 
+  def test_solver_mode_sign(self):
+    """Test that the eigenmode solver returns modes of a fixed sign."""
+    n = 150
+    width = 20
+    omega = 200e12 * 2 * np.pi
+    dl = 25e-9
+    epsilon_r = np.ones((n,))
+    epsilon_r[n // 2 - width // 2:n // 2 + width // 2] = 12.25
+
+    for order in (1, 2, 3):
+      e, h, beta = modes.solve_modes(epsilon_r, omega, dl, order=order)
+      # The first lobe of the mode should be negative.
+      first_lobe = np.argmax(np.abs(e) >= 0.5 * np.max(np.abs(e)))
+      self.assertLess(e[first_lobe].real, 0.)
+      np.testing.assert_array_equal(e.imag, 0.)
+      # The magnetic field should be in phase with the electric field.
+      np.testing.assert_allclose(h, beta / omega / constants.MU_0 * e)
+
+  def test_solver_dense_and_iterative_agree(self):
+    """Test that the dense and iterative eigensolvers find the same modes."""
+    n = 100
+    width = 20
+    omega = 200e12 * 2 * np.pi
+    dl = 25e-9
+    epsilon_r = np.ones((n,))
+    epsilon_r[n // 2 - width // 2:n // 2 + width // 2] = 12.25
+
+    for order in (1, 2, 3):
+      e_dense, _, beta_dense = modes.solve_modes(
+          epsilon_r, omega, dl, order=order)
+      with mock.patch.object(modes, '_DENSE_SOLVER_MAX_SIZE', 0):
+        e, _, beta = modes.solve_modes(epsilon_r, omega, dl, order=order)
+      np.testing.assert_allclose(beta_dense, beta, rtol=1e-12)
+      np.testing.assert_allclose(e_dense, e, atol=1e-8)
+
+  def test_field_profiles_cached(self):
+    """Test that the port modes are solved once for an unchanged slice."""
+    n = 100
+    width = 20
+    omega = 200e12 * 2 * np.pi
+    dl = 25e-9
+    epsilon_r = np.ones((n,))
+    epsilon_r[n // 2 - width // 2:n // 2 + width // 2] = 12.25
+    port = modes.WaveguidePort(
+        x=10,
+        y=n // 2,
+        width=n,
+        order=2,
+        dir=defs.Direction.X_POS,
+        offset=1,
+    )
+
+    e, h, beta = port.field_profiles(epsilon_r, omega, dl)
+    e_solved, h_solved, beta_solved = modes.solve_modes(
+        epsilon_r, omega, dl, order=2)
+    np.testing.assert_array_equal(e, e_solved)
+    np.testing.assert_array_equal(h, h_solved)
+    self.assertEqual(beta, beta_solved)
+    self.assertFalse(e.flags.writeable)
+    self.assertFalse(h.flags.writeable)
+
+    e_again, _, _ = port.field_profiles(epsilon_r.copy(), omega, dl)
+    self.assertIs(e_again, e)
+
+    epsilon_r[0] = 2.0
+    e_changed, _, _ = port.field_profiles(epsilon_r, omega, dl)
+    self.assertIsNot(e_changed, e)
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -45,5 +45,12 @@ def overlap(
   Returns:
     Result of the overlap integral.
   """
-  ac = tuple([npa.conj(ai) for ai in a])
-  return npa.sum(cross(ac, b)[normal.index])
+  # Only the component of the cross product along the normal contributes to
+  # the integral, so the other two components are not computed.
+  j, k = _CROSS_COMPONENTS[normal.index]
+  return npa.sum(npa.conj(a[j]) * b[k] - npa.conj(a[k]) * b[j])
+
+
+# The indices `(j, k)` of the vector components that form the component `i` of
+# a cross product, `(a x b)[i] = a[j] * b[k] - a[k] * b[j]`.
+_CROSS_COMPONENTS = ((1, 2), (2, 0), (0, 1))
@@ -101,6 +101,18 @@ class OpsTestOverlap(absltest.TestCase):
     )
     self.assertLess(np.abs(ans), _TOL_OVERLAP_MAG)
 
+  def test_normal_component_of_cross_product(self):
+    """Test that the overlap integrates the normal cross product component."""
+    rng = np.random.default_rng(0)
+    a = tuple(rng.normal(size=(9,)) + 1j * rng.normal(size=(9,)) for _ in 'xyz')
+    b = tuple(rng.normal(size=(9,)) + 1j * rng.normal(size=(9,)) for _ in 'xyz')
+    ac = tuple(np.conj(ai) for ai in a)
+    for normal in defs.Direction:
+      self.assertAlmostEqual(
+          ops.overlap(a, b, normal),
+          np.sum(ops.cross(ac, b)[normal.index]),
+      )
+
 
 if __name__ == '__main__':
   absltest.main()
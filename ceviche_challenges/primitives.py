@@ -17,6 +17,8 @@ from typing import Tuple
 
 import autograd
 import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
 
 
 @autograd.primitive
@@ -45,7 +47,7 @@ def insert_design_variable(design_var: np.ndarray, destination: np.ndarray,
         'The `design_var` array with shape {} does not fit into the '
         '`destination` array with shape {}'.format(design_var.shape,
                                                    destination.shape))
-  if not np.all([coord > 0 for coord in coords]):
+  if min(coords) <= 0:
     raise ValueError('All values in `coord` must be positive')
   if x_min >= x_max:
     raise ValueError('The min x value must be less than the max x value')
@@ -54,14 +56,73 @@ def insert_design_variable(design_var: np.ndarray, destination: np.ndarray,
   if (x_max >= destination.shape[0] or y_max >= destination.shape[1]):
     raise ValueError(
         'Box defined by `coords` extends outside of `destination` array')
-  destination_ = np.copy(destination)
+  # Promote the copy so that a lower precision `destination` does not truncate
+  # the values of `design_var`.
+  destination_ = destination.astype(
+      np.result_type(destination, design_var), copy=True)
   destination_[coords[0]:coords[2], coords[1]:coords[3]] = design_var
   return destination_
 
 
 def vjp_maker(ans, design_var, destination, coords):
   del ans, design_var, destination
-  return lambda x: x[coords[0]:coords[2], coords[1]:coords[3]]
+  # The gradient is copied out of the design region, so that it does not keep
+  # the gradient of the whole destination array alive as a view.
+  design_region = (slice(coords[0], coords[2]), slice(coords[1], coords[3]))
+  return lambda x: np.ascontiguousarray(x[design_region])
 
 
 autograd.extend.defvjp(insert_design_variable, vjp_maker, None, None)
+
+
+def _factorize(entries: np.ndarray, indices: np.ndarray,
+               size: int) -> scipy.sparse.linalg.SuperLU:
+  """LU factorization of the sparse matrix given by its entries and indices."""
+  matrix = scipy.sparse.csc_matrix((entries, (indices[0], indices[1])),
+                                   shape=(size, size),
+                                   dtype=np.complex128)
+  return scipy.sparse.linalg.splu(matrix)
+
+
+@autograd.primitive
+def sp_solve_multiple(entries: np.ndarray, indices: np.ndarray,
+                      b: np.ndarray) -> np.ndarray:
+  """Solve a sparse linear system `A x = b` for several right hand sides.
+
+  The matrix `A` is factorized once and the factorization is shared by all of
+  the right hand sides, i.e. the columns of `b`. Entries of `A` with the same
+  indices are summed, as in `ceviche.primitives.sp_solve`.
+
+  NOTE: This function only connects gradients flowing through `entries` and
+  not `indices` or `b`.
+
+  Args:
+    entries: An `np.ndarray` of shape `(num_non_zeros,)` specifying the values
+      of the non-zero entries of `A`.
+    indices: An `np.ndarray` of shape `(2, num_non_zeros)` specifying the row
+      and column indices of the non-zero entries of `A`.
+    b: An `np.ndarray` of shape `(n, num_rhs)` specifying the right hand sides.
+
+  Returns:
+    An `np.ndarray` with the same shape as `b` with the solutions, `x`.
+  """
+  return _factorize(entries, indices, b.shape[0]).solve(b)
+
+
+def sp_solve_multiple_vjp_maker(x, entries, indices, b):
+  # The adjoint problem is solved with the transpose of `A` for all right hand
+  # sides at once, and its outer product with `x` is accumulated over them.
+  # autograd passes no state from the forward solve to the VJP, so `A` is
+  # factorized again here, as `ceviche.primitives.sp_solve` does.
+  rows, cols = indices
+  lu = _factorize(entries, indices, b.shape[0])
+
+  def vjp(v):
+    grad = np.sum(lu.solve(-v, trans='T')[rows] * x[cols], axis=1)
+    return grad if np.iscomplexobj(entries) else np.real(grad)
+
+  return vjp
+
+
+autograd.extend.defvjp(sp_solve_multiple, sp_solve_multiple_vjp_maker, None,
+                       None)
@@ -24,14 +24,25 @@ import numpy as np
 def _gradient_numerical(func: Callable[[np.ndarray], float],
                         x: np.ndarray,
                         delta: float = 1e-7) -> np.ndarray:
-  """Helper for numerically computing the gradient of an R^n -> R^1 function."""
-  y = func(x)
+  """Helper for numerically computing the gradient of an R^n -> R^1 function.
+
+  The gradient is computed with central differences, which are accurate to
+  second order in `delta`.
+  """
+  # Each element is perturbed in place and restored, rather than copying the
+  # whole of `x` for every element.
+  x = np.array(x)
+  x_flat = x.reshape(-1)
   grad = np.zeros_like(x)
+  grad_flat = grad.reshape(-1)
   for i in range(x.size):
-    x_delta = np.copy(x)
-    x_delta.ravel()[i] += delta
-    y_delta = func(x_delta)
-    grad.ravel()[i] = (y_delta - y) / delta
+    x_i = x_flat[i]
+    x_flat[i] = x_i + delta
+    y_plus = func(x)
+    x_flat[i] = x_i - delta
+    y_minus = func(x)
+    grad_flat[i] = (y_plus - y_minus) / (2 * delta)
+    x_flat[i] = x_i
   return grad
 
 
@@ -81,6 +92,39 @@ class PrimitivesTest(absltest.TestCase):
       coords = (0, 4, 14, 9)
       primitives.insert_design_variable(design_var, destination, coords)
 
+  def test_sp_solve_multiple(self):
+    """Test the `sp_solve_multiple` primitive against a dense solve."""
+    rng = np.random.default_rng(0)
+    n = 20
+    matrix = rng.normal(size=(n, n)) + 1j * rng.normal(size=(n, n))
+    matrix += 10 * np.eye(n)
+    indices = np.stack(np.nonzero(matrix))
+    entries = matrix[indices[0], indices[1]]
+    b = rng.normal(size=(n, 3)) + 1j * rng.normal(size=(n, 3))
+    np.testing.assert_allclose(
+        primitives.sp_solve_multiple(entries, indices, b),
+        np.linalg.solve(matrix, b))
+
+  def test_grad_sp_solve_multiple(self):
+    """Test the gradient of the `sp_solve_multiple` primitive."""
+    rng = np.random.default_rng(0)
+    n = 10
+    indices = np.stack(np.nonzero(np.ones((n, n))))
+    diagonal = indices[0] == indices[1]
+    b = rng.normal(size=(n, 2)) + 1j * rng.normal(size=(n, 2))
+
+    def func(x):
+      entries = npa.where(diagonal, 10.0 + x, x)
+      return npa.sum(npa.abs(primitives.sp_solve_multiple(entries, indices,
+                                                          b))**2)
+
+    x = rng.normal(size=(n * n,))
+    np.testing.assert_allclose(
+        autograd.grad(func)(x),
+        _gradient_numerical(func, x, delta=1e-6),
+        rtol=1e-6,
+        atol=1e-9)
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -25,7 +25,6 @@ from typing import Tuple
 import autograd.numpy as npa
 from ceviche_challenges import defs
 from ceviche_challenges import modes
-from ceviche_challenges import ops
 import numpy as np
 
 
@@ -61,38 +60,54 @@ def calculate_amplitudes(
   coords = port.coords()
   et_m, ht_m, _ = port.field_profiles(epsilon_r[coords], omega, dl)
 
+  # The port is a contiguous line of pixels, so the simulated fields are
+  # sampled along it with basic slices rather than by gathering coordinates,
+  # which directly yield 1-D fields.
+  offset = port.signed_offset()
   if port.dir.is_along_x:
-    coords_offset = (coords[0] + port.signed_offset(), coords[1])
-    h = (0., npa.ravel(hy[coords_offset]), 0)
-    hm = (0., ht_m, 0.)
+    i = port.x + offset
+    j_slice = slice(port.y - port.width // 2, port.y + port.width // 2)
+    h = hy[i, j_slice]
+    # The normal component of conj(em) x h is -conj(et_m) * hy.
+    et_sign = -1.
     # The E-field is not co-located with the H-field in the Yee cell. Therefore,
     # we must sample at two neighboring pixels in the propataion direction and
     # then interpolate:
-    coords_e = (coords_offset[0] + np.array([[-1], [0]]), coords_offset[1])
-    e_yee_shifted = 0.5 * npa.sum(ez[coords_e], axis=0)
+    e_yee_shifted = 0.5 * (ez[i - 1, j_slice] + ez[i, j_slice])
   else:
-    coords_offset = (coords[0], coords[1] + port.signed_offset())
-    h = (npa.ravel(hx[coords_offset]), 0, 0)
-    hm = (-ht_m, 0., 0.)
+    j = port.y + offset
+    i_slice = slice(port.x - port.width // 2, port.x + port.width // 2)
+    h = hx[i_slice, j]
+    # The normal component of conj(em) x h is conj(et_m) * hx.
+    et_sign = 1.
     # The E-field is not co-located with the H-field in the Yee cell. Therefore,
     # we must sample at two neighboring pixels in the propataion direction and
     # then interpolate:
-    coords_e = (coords_offset[0], coords_offset[1] + np.array([[-1], [0]]))
-    e_yee_shifted = 0.5 * npa.sum(ez[coords_e], axis=0)
+    e_yee_shifted = 0.5 * (ez[i_slice, j - 1] + ez[i_slice, j])
 
-  e = (0., 0., e_yee_shifted)
-  em = (0., 0., et_m)
-
-  overlap1 = ops.overlap(em, h, port.dir)
-  overlap2 = ops.overlap(hm, e, port.dir)
-  normalization = ops.overlap(em, hm, port.dir)
-
-  # Phase convention in ceviche is exp(+jwt-jkz)
-  if port.dir.sign > 0:
-    s_p = (overlap1 + overlap2) / 2 / np.sqrt(2 * normalization)
-    s_m = (overlap1 - overlap2) / 2 / np.sqrt(2 * normalization)
-  else:
-    s_p = (overlap1 - overlap2) / 2 / np.sqrt(2 * normalization)
-    s_m = (overlap1 + overlap2) / 2 / np.sqrt(2 * normalization)
+  # The overlaps of the mode with the simulated H-field and E-field are taken
+  # over the same pixels, so they are computed with a single contraction of the
+  # stacked (conjugated) mode profiles and fields, where the overlap with the
+  # E-field reduces to sum(conj(ht_m) * ez) for either port orientation.
+  #
+  # Phase convention in ceviche is exp(+jwt-jkz), so the forward and backward
+  # amplitudes swap for ports facing the negative direction. This amounts to
+  # flipping the sign of the E-field overlap, which is applied to the (untraced)
+  # mode profile rather than by branching on the amplitudes.
+  overlap1, overlap2 = npa.einsum(
+      'kw,kw->k',
+      np.stack([et_sign * np.conj(et_m), port.dir.sign * np.conj(ht_m)]),
+      npa.stack([h, e_yee_shifted]),
+  )
+  # The overlap of the mode with itself only depends on the mode, so it is a
+  # plain (untraced) inner product. With the mode E-field along z and its
+  # H-field transverse to the port direction, the normal component of
+  # conj(em) x hm is -conj(et_m) * ht_m for either port orientation.
+  normalization = -np.vdot(et_m, ht_m)
 
+  # The scale of both amplitudes is a constant, which is computed once and
+  # multiplied in.
+  scale = 0.5 / np.sqrt(2 * normalization)
+  s_p = (overlap1 + overlap2) * scale
+  s_m = (overlap1 - overlap2) * scale
   return s_p, s_m
@@ -13,7 +13,8 @@
 # limitations under the License.
 """Tests for ceviche_challenges.scattering."""
 
-from typing import List, Tuple
+import math
+from typing import List, Sequence, Tuple
 
 from absl.testing import absltest
 from absl.testing import parameterized
@@ -41,16 +42,69 @@ _REL_ERROR_TOL = 1e-4
 
 
 def power_dB(x):  # pylint: disable=invalid-name
-  return 20 * np.log10(np.abs(x))
-
-
-class StraightWaveguideScatteringTest(absltest.TestCase):
-
-  def setUp(self):
-    super().setUp()
-    self.npml = 20
-    self.omega = 2 * np.pi * 200e12
-    self.dl = 25e-9
+  # `x` is a scalar amplitude ratio, so `math` avoids NumPy's ufunc dispatch.
+  power = x.real * x.real + x.imag * x.imag
+  return 10 * math.log10(power) if power else -math.inf
+
+
+def _paint_rects(
+    shape: Tuple[int, int],
+    rects: Sequence[Tuple[int, int, int, int]],
+    fill: float,
+    background: float = 1.0,
+) -> np.ndarray:
+  """A permittivity distribution of rectangles on a uniform background.
+
+  Args:
+    shape: The shape of the distribution, in pixel units.
+    rects: The rectangles as `(x0, x1, y0, y1)` pixel bounds, with exclusive
+      upper bounds.
+    fill: The permittivity of the rectangles.
+    background: The permittivity outside of the rectangles.
+
+  Returns:
+    A C-contiguous `np.ndarray` of the given shape.
+  """
+  epsr = np.full(shape, background)
+  for x0, x1, y0, y1 in rects:
+    epsr[x0:x1, y0:y1] = fill
+  return epsr
+
+
+def solve(
+    omega: float,
+    dl: float,
+    epsr: np.ndarray,
+    npml: int,
+    sources: Sequence[np.ndarray],
+) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+  """Solves for the fields of sources with `ceviche.fdfd_ez.solve()`.
+
+  The public solver of `ceviche` is used, rather than the solver of the models,
+  so that the tests provide an independent reference for the latter.
+
+  Args:
+    omega: The angular frequency of the simulation.
+    dl: The grid cell size of the simulation, in meters.
+    epsr: The permittivity distribution to simulate.
+    npml: The number of PML cells on each side of the domain.
+    sources: The source distributions, each with the same shape as `epsr`.
+
+  Returns:
+    A list with the Hx, Hy, and Ez fields of each source.
+  """
+  simulation = ceviche.fdfd_ez(omega, dl, epsr, [npml, npml])
+  return [simulation.solve(source) for source in sources]
+
+
+class StraightWaveguideScatteringTest(parameterized.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    cls.npml = 20
+    cls.omega = 2 * np.pi * 200e12
+    cls.dl = 25e-9
 
   def build_model(self,
                   shape: Tuple[int, int] = (100, 100),
@@ -76,10 +130,14 @@ class StraightWaveguideScatteringTest(absltest.TestCase):
     Returns:
       The geometry and a list of ports
     """
-    epsr = np.ones(shape)
+    # The core spans the whole domain along the waveguide, so every pixel is
+    # written once, by broadcasting the transverse permittivity profile.
+    profile = np.ones(shape[1] if direction.is_along_x else shape[0])
+    center = profile.size // 2
+    profile[center - wg_width // 2:center + wg_width // 2] = _WG_PERMITTIVITY
+    epsr = np.empty(shape)
     if direction.is_along_x:
-      epsr[:, shape[1] // 2 - wg_width // 2:shape[1] // 2 +
-           wg_width // 2] = _WG_PERMITTIVITY
+      epsr[:] = profile
       port1 = modes.WaveguidePort(
           x=self.npml + 1,
           y=shape[1] // 2,
@@ -95,8 +153,7 @@ class StraightWaveguideScatteringTest(absltest.TestCase):
           dir=defs.Direction.X_NEG,
           offset=offset)
     else:
-      epsr[shape[0] // 2 - wg_width // 2:shape[0] // 2 +
-           wg_width // 2, :] = _WG_PERMITTIVITY
+      epsr[:] = profile[:, np.newaxis]
       port1 = modes.WaveguidePort(
           y=self.npml + 1,
           x=shape[0] // 2,
@@ -126,150 +183,105 @@ class StraightWaveguideScatteringTest(absltest.TestCase):
     Returns:
       the complex-valued scattering parameters: s_1+, s_1-, s_2+, s_2-
     """
-    simulation = ceviche.fdfd_ez(self.omega, self.dl, epsr,
-                                 [self.npml, self.npml])
-
-    hx, hy, ez = simulation.solve(ports[which_port].source_fdfd(
-        self.omega, self.dl, epsr))
+    [(hx, hy, ez)] = solve(
+        self.omega, self.dl, epsr, self.npml,
+        [ports[which_port].source_fdfd(self.omega, self.dl, epsr)])
     s1p, s1m = scattering.calculate_amplitudes(self.omega, self.dl, ports[0],
                                                ez, hy, hx, epsr)
     s2p, s2m = scattering.calculate_amplitudes(self.omega, self.dl, ports[1],
                                                ez, hy, hx, epsr)
     return s1p, s1m, s2p, s2m
 
-  def test_xplus(self):
-    """Measure transmission and reflection from a straight waveguide.
-
-    This test excites the fundamental mode in the +x direction
-    """
-    epsr, ports = self.build_model(
-        offset=5,
-        direction=defs.Direction.X_POS,
-        order=1,
-        shape=(100, 100),
-        wg_width=10)
-    s1p, s1m, _, s2m = self.run_model(epsr, ports, 0)
-    r_db = power_dB(s1m / s1p)
-    t_db = power_dB(s2m / s1p)
-    self.assertLess(r_db, _THRESHOLD_R_DB)
-    self.assertGreater(t_db, _THRESHOLD_T_DB)
-
-  def test_xplus_2nd_order_mode(self):
-    """Measure transmission and reflection from a straight waveguide.
-
-    This test excites the second-order mode in the +x direction
-    """
-    epsr, ports = self.build_model(
-        offset=5,
-        direction=defs.Direction.X_POS,
-        order=2,
-        shape=(130, 130),
-        wg_width=20)
-    s1p, s1m, _, s2m = self.run_model(epsr, ports, 0)
-    r_db = power_dB(s1m / s1p)
-    t_db = power_dB(s2m / s1p)
-    self.assertLess(r_db, _THRESHOLD_R_DB)
-    self.assertGreater(t_db, _THRESHOLD_T_DB)
-
-  def test_xminus(self):
-    """Measure transmission and reflection from a straight waveguide.
-
-    This test excites the fundamental mode in the -x direction
-    """
-    epsr, ports = self.build_model(
-        offset=5,
-        direction=defs.Direction.X_NEG,
-        order=1,
-        shape=(100, 100),
-        wg_width=10)
-    _, s1m, s2p, s2m = self.run_model(epsr, ports, 1)
-    r_db = power_dB(s2m / s2p)
-    t_db = power_dB(s1m / s2p)
-    self.assertLess(r_db, _THRESHOLD_R_DB)
-    self.assertGreater(t_db, _THRESHOLD_T_DB)
-
-  def test_xminus_2nd_order_mode(self):
-    """Measure transmission and reflection from a straight waveguide.
-
-    This test excites the second-order mode in the -x direction
-    """
-    epsr, ports = self.build_model(
-        offset=5,
-        direction=defs.Direction.X_NEG,
-        order=2,
-        shape=(130, 130),
-        wg_width=20)
-    _, s1m, s2p, s2m = self.run_model(epsr, ports, 1)
-    r_db = power_dB(s2m / s2p)
-    t_db = power_dB(s1m / s2p)
-    self.assertLess(r_db, _THRESHOLD_R_DB)
-    self.assertGreater(t_db, _THRESHOLD_T_DB)
-
-  def test_yplus(self):
-    """Measure transmission and reflection from a straight waveguide.
-
-    This test excites the fundamental mode in the +y direction
-    """
-    epsr, ports = self.build_model(
-        offset=5,
-        direction=defs.Direction.Y_POS,
-        order=1,
-        shape=(100, 100),
-        wg_width=10)
-    s1p, s1m, _, s2m = self.run_model(epsr, ports, 0)
-    r_db = power_dB(s1m / s1p)
-    t_db = power_dB(s2m / s1p)
-    self.assertLess(r_db, _THRESHOLD_R_DB)
-    self.assertGreater(t_db, _THRESHOLD_T_DB)
-
-  def test_yplus_2nd_order_mode(self):
-    """Measure transmission and reflection from a straight waveguide.
-
-    This test excites the second-order mode in the +y direction
-    """
-    epsr, ports = self.build_model(
-        offset=5,
-        direction=defs.Direction.Y_POS,
-        order=2,
-        shape=(130, 130),
-        wg_width=20)
-    s1p, s1m, _, s2m = self.run_model(epsr, ports, 0)
-    r_db = power_dB(s1m / s1p)
-    t_db = power_dB(s2m / s1p)
-    self.assertLess(r_db, _THRESHOLD_R_DB)
-    self.assertGreater(t_db, _THRESHOLD_T_DB)
-
-  def test_yminus(self):
+  @parameterized.named_parameters(
+      {
+          'testcase_name': 'xplus',
+          'direction': defs.Direction.X_POS,
+          'order': 1,
+          'shape': (100, 100),
+          'wg_width': 10,
+      },
+      {
+          'testcase_name': 'xplus_2nd_order_mode',
+          'direction': defs.Direction.X_POS,
+          'order': 2,
+          'shape': (130, 130),
+          'wg_width': 20,
+      },
+      {
+          'testcase_name': 'xminus',
+          'direction': defs.Direction.X_NEG,
+          'order': 1,
+          'shape': (100, 100),
+          'wg_width': 10,
+      },
+      {
+          'testcase_name': 'xminus_2nd_order_mode',
+          'direction': defs.Direction.X_NEG,
+          'order': 2,
+          'shape': (130, 130),
+          'wg_width': 20,
+      },
+      {
+          'testcase_name': 'yplus',
+          'direction': defs.Direction.Y_POS,
+          'order': 1,
+          'shape': (100, 100),
+          'wg_width': 10,
+      },
+      {
+          'testcase_name': 'yplus_2nd_order_mode',
+          'direction': defs.Direction.Y_POS,
+          'order': 2,
+          'shape': (130, 130),
+          'wg_width': 20,
+      },
+      {
+          'testcase_name': 'yminus',
+          'direction': defs.Direction.Y_NEG,
+          'order': 1,
+          'shape': (100, 100),
+          'wg_width': 10,
+      },
+      {
+          'testcase_name': 'yminus_2nd_order_mode',
+          'direction': defs.Direction.Y_NEG,
+          'order': 2,
+          'shape': (130, 130),
+          'wg_width': 20,
+      },
+  )
+  def test_transmission(
+      self,
+      direction: defs.Direction,
+      order: int,
+      shape: Tuple[int, int],
+      wg_width: int,
+  ):
     """Measure transmission and reflection from a straight waveguide.
 
-    This test excites the fundamental mode in the -y direction
-    """
-    epsr, ports = self.build_model(
-        offset=5,
-        direction=defs.Direction.Y_NEG,
-        order=1,
-        shape=(100, 100),
-        wg_width=10)
-    _, s1m, s2p, s2m = self.run_model(epsr, ports, 1)
-    r_db = power_dB(s2m / s2p)
-    t_db = power_dB(s1m / s2p)
-    self.assertLess(r_db, _THRESHOLD_R_DB)
-    self.assertGreater(t_db, _THRESHOLD_T_DB)
-
-  def test_yminus_2nd_order_mode(self):
-    """Measure transmission and reflection from a straight waveguide.
+    The mode of the given order is excited at the port facing `direction`, i.e.
+    the first port for a positive and the second port for a negative direction.
 
-    This test excites the second-order mode in the -y direction
+    Args:
+      direction: The direction in which the mode is excited.
+      order: The order of the excited and measured modes.
+      shape: The size of the domain, in pixel units.
+      wg_width: The width of the waveguide core, in pixel units.
     """
     epsr, ports = self.build_model(
         offset=5,
-        direction=defs.Direction.Y_NEG,
-        order=2,
-        shape=(130, 130),
-        wg_width=20)
-    _, s1m, s2p, s2m = self.run_model(epsr, ports, 1)
-    r_db = power_dB(s2m / s2p)
-    t_db = power_dB(s1m / s2p)
+        direction=direction,
+        order=order,
+        shape=shape,
+        wg_width=wg_width)
+    excite_port_idx = 0 if direction.sign > 0 else 1
+    s1p, s1m, s2p, s2m = self.run_model(epsr, ports, excite_port_idx)
+    if excite_port_idx == 0:
+      r_db = power_dB(s1m / s1p)
+      t_db = power_dB(s2m / s1p)
+    else:
+      r_db = power_dB(s2m / s2p)
+      t_db = power_dB(s1m / s2p)
     self.assertLess(r_db, _THRESHOLD_R_DB)
     self.assertGreater(t_db, _THRESHOLD_T_DB)
 
@@ -409,27 +421,31 @@ class TransmissionComparisonTest(parameterized.TestCase):
         transposed, allowing it to run in the y-direction.
     """
 
+    # Every length is resolved to grid units once, up front.
+    feed, kink, padding, width, offset, source_distance = [
+        u.resolve(length, dl) for length in (length_feed, length_kink,
+                                             wg_padding, wg_width, offset_kink,
+                                             source_pml_distance)
+    ]
     shape = (
-        2 * npml + u.resolve(length_kink + 2 * length_feed, dl),
-        2 * npml + u.resolve(offset_kink + wg_width + 2 * wg_padding, dl),
+        2 * npml + kink + 2 * feed,
+        2 * npml + offset + width + 2 * padding,
     )
 
-    epsr = np.ones(shape)
-    epsr[:npml + u.resolve(length_feed, dl),
-         npml + u.resolve(wg_padding, dl):npml +
-         u.resolve(wg_padding + wg_width, dl),] = permittivity
-    epsr[-npml - u.resolve(length_feed, dl):,
-         npml + u.resolve(wg_padding + offset_kink, dl):npml +
-         u.resolve(wg_padding + offset_kink + wg_width, dl),] = permittivity
-    epsr[npml + u.resolve(length_feed, dl):npml +
-         u.resolve(length_feed + length_kink, dl),
-         npml + u.resolve(wg_padding, dl):npml +
-         u.resolve(wg_padding + offset_kink + wg_width, dl),] = permittivity
-
-    p1_x = npml + u.resolve(source_pml_distance, dl)
-    p1_y = npml + u.resolve(wg_padding + wg_width / 2, dl)
-    p2_x = shape[0] - npml - u.resolve(source_pml_distance, dl)
-    p2_y = npml + u.resolve(wg_padding + wg_width / 2 + offset_kink, dl)
+    # The feeds and the kink, as (x0, x1, y0, y1) bounds for propagation along
+    # x.
+    rects = [
+        (0, npml + feed, npml + padding, npml + padding + width),
+        (shape[0] - npml - feed, shape[0], npml + padding + offset,
+         npml + padding + offset + width),
+        (npml + feed, npml + feed + kink, npml + padding,
+         npml + padding + offset + width),
+    ]
+
+    p1_x = npml + source_distance
+    p1_y = npml + padding + u.resolve(wg_width / 2, dl)
+    p2_x = shape[0] - npml - source_distance
+    p2_y = p1_y + offset
     p1_dir = defs.Direction.X_POS
     p2_dir = defs.Direction.X_NEG
     if transpose:
@@ -441,77 +457,49 @@ class TransmissionComparisonTest(parameterized.TestCase):
       p2_y = tmp
       p1_dir = defs.Direction.Y_POS
       p2_dir = defs.Direction.Y_NEG
-      epsr = epsr.T
+      # The transposed geometry is painted directly, rather than transposing
+      # the distribution into a non-contiguous view.
+      shape = shape[::-1]
+      rects = [(y0, y1, x0, x1) for x0, x1, y0, y1 in rects]
+    epsr = _paint_rects(shape, rects, permittivity)
 
     port1 = modes.WaveguidePort(
         x=p1_x,
         y=p1_y,
-        width=u.resolve(wg_width + 2 * wg_padding, dl),
+        width=width + 2 * padding,
         order=mode_order,
         dir=p1_dir,
         offset=monitor_offset)
     port2 = modes.WaveguidePort(
         x=p2_x,
         y=p2_y,
-        width=u.resolve(wg_width + 2 * wg_padding, dl),
+        width=width + 2 * padding,
         order=mode_order,
         dir=p2_dir,
         offset=monitor_offset)
 
     ports = [port1, port2]
 
-    simulation = ceviche.fdfd_ez(omega, dl.to_value('m'), epsr, [npml, npml])
-
+    dl_m = dl.to_value('m')
     s = []
-    fields = []
-    hx, hy, ez = simulation.solve(ports[0].source_fdfd(omega, dl.to_value('m'),
-                                                       epsr))
-    s1p, s1m = scattering.calculate_amplitudes(
-        omega,
-        dl.to_value('m'),
-        ports[0],
-        ez,
-        hy,
-        hx,
-        epsr,
-    )
-    s2p, s2m = scattering.calculate_amplitudes(
-        omega,
-        dl.to_value('m'),
-        ports[1],
-        ez,
-        hy,
-        hx,
-        epsr,
-    )
-    s.append([s1m / s1p, s2m / s1p])
-    fields.append(ez)
-
-    ###
-
-    hx, hy, ez = simulation.solve(ports[1].source_fdfd(omega, dl.to_value('m'),
-                                                       epsr))
-    s1p, s1m = scattering.calculate_amplitudes(
-        omega,
-        dl.to_value('m'),
-        ports[0],
-        ez,
-        hy,
-        hx,
-        epsr,
-    )
-    s2p, s2m = scattering.calculate_amplitudes(
-        omega,
-        dl.to_value('m'),
-        ports[1],
-        ez,
-        hy,
-        hx,
-        epsr,
-    )
-    s.append([s1m / s2p, s2m / s2p])
-    s = np.array(s)
-    rerr = np.linalg.norm(np.abs(s) - np.abs(s).T) / np.linalg.norm(np.abs(s))
+    excitations = solve(omega, dl_m, epsr, npml,
+                        [port.source_fdfd(omega, dl_m, epsr) for port in ports])
+    for excite_port_idx, (hx, hy, ez) in enumerate(excitations):
+      amplitudes = [
+          scattering.calculate_amplitudes(
+              omega,
+              dl_m,
+              port,
+              ez,
+              hy,
+              hx,
+              epsr,
+          ) for port in ports
+      ]
+      sp = amplitudes[excite_port_idx][0]
+      s.append([sm / sp for _, sm in amplitudes])
+    s = np.abs(s)
+    rerr = np.linalg.norm(s - s.T) / np.linalg.norm(s)
     self.assertLess(rerr, _REL_ERROR_TOL)
 
 
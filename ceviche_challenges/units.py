@@ -13,7 +13,7 @@
 # limitations under the License.
 """Definitions of compatible units, and tools for using unitted quantities."""
 
-from typing import Optional, Sequence as Sequence_
+from typing import Optional, Sequence as Sequence_, Tuple
 
 import numpy as np
 import unyt
@@ -81,6 +81,46 @@ def resolve(v: Quantity, resolution: Quantity) -> int:
     return resolved
 
 
+def resolve_many(vs: Sequence, resolution: Quantity) -> Tuple[int, ...]:
+  """Resolves each of `vs` to an integer number of grid units at `resolution`.
+
+  This is equivalent to calling `resolve` on each element of `vs`, but converts
+  and rounds all of the quantities in a single vectorized operation.
+
+  Args:
+    vs: a sequence of unitted-quantities with the same dimension.
+    resolution: a grid resolution in the same *dimension* (if not units) as
+      `vs`.
+
+  Returns:
+    a tuple with the integer number of grid units (with scale `resolution`)
+    that equates to each of `vs`, within a numerical tolerance.
+
+  Raises:
+    ResolutionError: if any of `vs` is not an integral multiple of `resolution`.
+    ValueError: if `vs` and `resolution` have incompatible unit dimensions.
+  """
+  if not isinstance(vs, Array):
+    for v in vs:
+      _check_compatible(v, resolution)
+    vs = Array(vs)
+  elif vs.size:
+    # The quantities of an `Array` share their units, so checking one suffices.
+    _check_compatible(vs[0], resolution)
+  if not vs.size:
+    return ()
+  # As in `_resolve_or_none`, the ratios are computed on plain floats.
+  factor, _ = vs.units.get_conversion_factor(resolution.units)
+  counts = vs.d * factor / float(resolution.value)
+  counts_rounded = np.round(counts).astype(int)
+  unresolved = np.abs(counts - counts_rounded) >= _RESOLUTION_TOLERANCE
+  if np.any(unresolved):
+    raise ResolutionError(
+        "Cannot neatly resolve quantity (%r) at given resolution (%r)." %
+        (vs[np.argmax(unresolved)], resolution))
+  return tuple(counts_rounded.tolist())
+
+
 def _check_compatible(v: Quantity, resolution: Quantity):
   """Checks compatibility for `Quantity` and dimensions."""
   if not (isinstance(v, Quantity) and isinstance(resolution, Quantity)):
@@ -109,9 +149,12 @@ def _resolve_or_none(
     the integer multiple `q` resulting from the resolution operation, or `None`.
   """
   _check_compatible(v, resolution)
-  count = v / resolution
-  count_rounded = np.round(count).astype(int)
-  if np.max(np.abs(count - count_rounded)) < tolerance:
+  # Both arguments are scalars, so the ratio is computed on plain floats, which
+  # is much cheaper than dividing the quantities through unyt.
+  factor, _ = v.units.get_conversion_factor(resolution.units)
+  count = float(v.value) * factor / float(resolution.value)
+  count_rounded = round(count)
+  if abs(count - count_rounded) < tolerance:
     return count_rounded
   else:
     return None
@@ -0,0 +1,92 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for ceviche_challenges.units."""
+
+from absl.testing import absltest
+
+from ceviche_challenges import units as u
+
+import unyt
+
+s = unyt.s  # pytype: disable=module-attr
+
+
+class ResolveTest(absltest.TestCase):
+
+  def test_resolve(self):
+    """Test resolving quantities in the same and in different units."""
+    self.assertEqual(u.resolve(500 * u.nm, 25 * u.nm), 20)
+    self.assertEqual(u.resolve(1.5 * u.um, 25 * u.nm), 60)
+    self.assertEqual(u.resolve(0 * u.nm, 25 * u.nm), 0)
+    self.assertIsInstance(u.resolve(1.5 * u.um, 25 * u.nm), int)
+
+  def test_resolve_within_tolerance(self):
+    """Test that resolving tolerates a small fraction of the resolution."""
+    self.assertEqual(u.resolve(500.001 * u.nm, 25 * u.nm), 20)
+
+  def test_resolve_errors(self):
+    """Test resolving quantities that are not integral or compatible."""
+    with self.assertRaises(u.ResolutionError):
+      u.resolve(510 * u.nm, 25 * u.nm)
+    with self.assertRaisesRegex(ValueError, 'must be of type `Quantity`'):
+      u.resolve(500., 25 * u.nm)
+    with self.assertRaisesRegex(ValueError, 'compatible unit dimensions'):
+      u.resolve(500 * s, 25 * u.nm)
+
+  def test_resolve_many(self):
+    """Test that `resolve_many` matches `resolve` for each quantity."""
+    resolution = 25 * u.nm
+    vs = [500 * u.nm, 1.5 * u.um, 0 * u.nm, 25.001 * u.nm]
+    self.assertEqual(
+        u.resolve_many(vs, resolution),
+        tuple(u.resolve(v, resolution) for v in vs),
+    )
+    self.assertEqual(u.resolve_many(vs, resolution), (20, 60, 0, 1))
+    for count in u.resolve_many(vs, resolution):
+      self.assertIsInstance(count, int)
+
+  def test_resolve_many_mixed_units(self):
+    """Test resolving a sequence of quantities in different units."""
+    self.assertEqual(
+        u.resolve_many([1 * u.um, 500 * u.nm, 0.25 * u.um], 50 * u.nm),
+        (20, 10, 5),
+    )
+
+  def test_resolve_many_array(self):
+    """Test resolving an `Array` of quantities."""
+    self.assertEqual(
+        u.resolve_many(u.Array([1., 2., 0.5], u.um), 250 * u.nm),
+        (4, 8, 2),
+    )
+
+  def test_resolve_many_empty(self):
+    """Test resolving an empty sequence of quantities."""
+    self.assertEqual(u.resolve_many([], 25 * u.nm), ())
+
+  def test_resolve_many_errors(self):
+    """Test resolving sequences that are not integral or compatible."""
+    with self.assertRaisesRegex(u.ResolutionError, '510'):
+      u.resolve_many([500 * u.nm, 510 * u.nm], 25 * u.nm)
+    with self.assertRaises(u.ResolutionError):
+      u.resolve_many(u.Array([1., 1.01], u.um), 25 * u.nm)
+    with self.assertRaisesRegex(ValueError, 'must be of type `Quantity`'):
+      u.resolve_many([500 * u.nm, 500.], 25 * u.nm)
+    with self.assertRaisesRegex(ValueError, 'compatible unit dimensions'):
+      u.resolve_many([500 * u.nm, 1 * s], 25 * u.nm)
+    with self.assertRaisesRegex(ValueError, 'compatible unit dimensions'):
+      u.resolve_many(u.Array([1., 2.], 's'), 25 * u.nm)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -42,6 +42,7 @@ class WaveguideBendModel(model_base.Model):
       params: Parameters for the ceviche simulation.
       spec: Specification of the waveguide bend geometry.
     """
+    super().__init__()
     self.params = params
     self.spec = spec
     extent_i, extent_j = spec.extent_ij(params.resolution)
@@ -103,7 +104,7 @@ class WaveguideBendModel(model_base.Model):
         offset=monitor_offset)
 
     if init_design_region:
-      density[self.design_region] = 1.0
+      density[self.design_region_slice] = 1.0
 
     self._density_bg = density
     self._ports = [port1, port2]
@@ -80,10 +80,9 @@ class WaveguideBendSpec:
     vi, vj = self.variable_region_size
     assert self.wg_width <= vi
     assert self.wg_width <= vj
-    assert (self.wg_mode_padding + self.wg_width / 2) <= (
-        vi / 2 + self.wg_length)
-    assert (self.wg_mode_padding + self.wg_width / 2) <= (
-        vj / 2 + self.wg_length)
+    mode_half_width = self.wg_mode_padding + self.wg_width / 2
+    assert mode_half_width <= vi / 2 + self.wg_length
+    assert mode_half_width <= vj / 2 + self.wg_length
 
   def extent_ij(self, resolution: Q) -> Tuple[Q, Q]:
     """The total in-plane extent of the structure.
@@ -31,6 +31,9 @@ class WdmModel(model_base.Model):
   def __init__(self, params: _params.CevicheSimParams, spec: _spec.WdmSpec):
     """Initializes a new model using `SimParams` and `WdmSpec`.
 
+    The geometry of the model is derived from `spec` once, here. A `spec` that
+    is assigned to the model later may only differ in its permittivities.
+
     Args:
       params: `SimParams` specifying the simulation parameters.
       spec: `WdmSpec` specifying the geometry of the WDM.
@@ -43,6 +46,14 @@ class WdmModel(model_base.Model):
         u.resolve(extent_i, params.resolution),
         u.resolve(extent_j, params.resolution),
     )
+    (x_min, y_min), (x_max, y_max) = [
+        [u.resolve(v, params.resolution) for v in corner]
+        for corner in spec.variable_region
+    ]
+    self._design_region_coords = (x_min, y_min, x_max, y_max)
+    self._dl = params.resolution.to_value('m')
+    self._output_wavelengths = u.Array(params.wavelengths).to_value(u.nm)
+    self._output_wavelengths.flags.writeable = False
     self._make_bg_density_and_ports()
 
   def _make_bg_density_and_ports(self, init_design_region: bool = True):
@@ -53,7 +64,7 @@ class WdmModel(model_base.Model):
       init_design_region: `bool` specifying whether the pixels in the background
         density distribution that lie within the design region should be
         initialized to a non-zero value. If `True`, the pixels are initialized
-        to a value of `0.5`.
+        to a value of `1.0`.
     Side effects: Initializes `_density_bg`, an `np.ndarray` specifying the
       background material density distribution of the WDM. Initalizes `ports`, a
       `List[Port]` that specifies the ports of the WDM.
@@ -61,44 +72,74 @@ class WdmModel(model_base.Model):
     p = self.params
     s = self.spec
 
-    density = np.zeros(self.shape)
+    # Each row block of the domain (before, within, and after the design region
+    # along i) is written once, by broadcasting a column mask, so the array is
+    # not zero-filled first.
+    density = np.empty(self.shape)
 
     monitor_offset = 5
     ports = []
 
-    design_region_x0, _, design_region_x1, _ = self.design_region_coords
+    (design_region_x0, design_region_y0, design_region_x1,
+     design_region_y1) = self.design_region_coords
+    half_width = s.wg_width / 2
+    (
+        input_y1,
+        input_y2,
+        input_port_i,
+        input_port_j,
+        output_port_i,
+        port_width,
+    ) = u.resolve_many(
+        (
+            s.input_wg_j - half_width,
+            s.input_wg_j + half_width,
+            s.input_mode_i,
+            s.input_wg_j,
+            s.output_mode_i,
+            s.wg_width + 2 * s.wg_mode_padding,
+        ),
+        p.resolution,
+    )
+    output_wgs_j = u.Array(s.output_wgs_j)
+    output_y1s = u.resolve_many(output_wgs_j - half_width, p.resolution)
+    output_y2s = u.resolve_many(output_wgs_j + half_width, p.resolution)
+    output_port_js = u.resolve_many(output_wgs_j, p.resolution)
 
     # Input waveguide
-    y1 = u.resolve(s.input_wg_j - s.wg_width / 2, p.resolution)
-    y2 = u.resolve(s.input_wg_j + s.wg_width / 2, p.resolution)
-    density[:design_region_x0, y1:y2] = 1.0
+    input_wg_cols = np.zeros(self.shape[1], dtype=bool)
+    input_wg_cols[input_y1:input_y2] = True
+    density[:design_region_x0] = input_wg_cols
 
     # Input port
     ports.append(
         modes.WaveguidePort(
-            x=u.resolve(s.input_mode_i, p.resolution),
-            y=u.resolve(s.input_wg_j, p.resolution),
-            width=u.resolve(s.wg_width + 2 * s.wg_mode_padding, p.resolution),
+            x=input_port_i,
+            y=input_port_j,
+            width=port_width,
             order=1,
             dir=defs.Direction.X_POS,
             offset=monitor_offset))
 
-    # Output waveguides
-    for output_wg_j in s.output_wgs_j:
-      y1 = u.resolve(output_wg_j - s.wg_width / 2, p.resolution)
-      y2 = u.resolve(output_wg_j + s.wg_width / 2, p.resolution)
-      density[design_region_x1:, y1:y2] = 1.0
+    # Output waveguides, which all run from the design region to the end of the
+    # domain, so that they are written at once by broadcasting a column mask.
+    output_wg_cols = np.zeros(self.shape[1], dtype=bool)
+    for y1, y2, port_j in zip(output_y1s, output_y2s, output_port_js):
+      output_wg_cols[y1:y2] = True
       ports.append(
           modes.WaveguidePort(
-              x=u.resolve(s.output_mode_i, p.resolution),
-              y=u.resolve(output_wg_j, p.resolution),
-              width=u.resolve(s.wg_width + 2 * s.wg_mode_padding, p.resolution),
+              x=output_port_i,
+              y=port_j,
+              width=port_width,
               order=1,
               dir=defs.Direction.X_NEG,
               offset=monitor_offset))
+    density[design_region_x1:] = output_wg_cols
 
+    design_region_cols = np.zeros(self.shape[1], dtype=bool)
     if init_design_region:
-      density = density + self.design_region.astype(np.float64)
+      design_region_cols[design_region_y0:design_region_y1] = True
+    density[design_region_x0:design_region_x1] = design_region_cols
 
     self._density_bg = density
     self._ports = ports
@@ -106,11 +147,7 @@ class WdmModel(model_base.Model):
   @property
   def design_region_coords(self) -> Tuple[int, int, int, int]:
     """The coordinates of the design region as (x_min, y_min, x_max, y_max)."""
-    s = self.spec
-    p = self.params
-    x_min, y_min = [u.resolve(v, p.resolution) for v in s.variable_region[0]]
-    x_max, y_max = [u.resolve(v,p.resolution) for v in s.variable_region[1]]
-    return (x_min, y_min, x_max, y_max)
+    return self._design_region_coords
 
   @property
   def shape(self) -> Tuple[int, int]:
@@ -137,8 +174,7 @@ class WdmModel(model_base.Model):
   @property
   def dl(self) -> float:
     """The grid resolution of the model."""
-    p = self.params
-    return p.resolution.to_value('m')
+    return self._dl
 
   @property
   def pml_width(self) -> int:
@@ -154,4 +190,4 @@ class WdmModel(model_base.Model):
   @property
   def output_wavelengths(self) -> List[float]:
     """A list of the wavelengths, in nm, to output fields and s-parameters."""
-    return u.Array(self.params.wavelengths).to_value(u.nm)
+    return self._output_wavelengths
@@ -13,6 +13,8 @@
 # limitations under the License.
 """Tests for ceviche_challenges.wdm.model."""
 
+import dataclasses
+
 from absl.testing import absltest
 
 from ceviche_challenges import units as u
@@ -65,11 +67,16 @@ TINY_PARAMS = prefabs.wdm_sim_params(resolution=h)
 
 class SimulationsGoldenTest(absltest.TestCase):
 
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    cls.params = prefabs.wdm_sim_params()
+    cls.spec = prefabs.wdm_spec()
+    cls.model = model.WdmModel(cls.params, cls.spec)
+
   def test_wdm(self):
     """Test of the model running the wdm prefab to produce known values."""
-    params = prefabs.wdm_sim_params()
-    spec = prefabs.wdm_spec()
-    m = model.WdmModel(params, spec)
+    m = self.model
     design_var = np.ones(m.design_variable_shape)
     s_params, _ = m.simulate(design_var)
     np.testing.assert_allclose(
@@ -80,9 +87,7 @@ class SimulationsGoldenTest(absltest.TestCase):
 
   def test_wdm_with_injected_wavelenghts(self):
     """Tests running the wdm with explicitly specified wavelengths."""
-    params = prefabs.wdm_sim_params()
-    spec = prefabs.wdm_spec()
-    m = model.WdmModel(params, spec)
+    m = self.model
     design_var = np.ones(m.design_variable_shape)
 
     # Test explicitly passing 1270, 1290, 1310nm.
@@ -97,11 +102,16 @@ class SimulationsGoldenTest(absltest.TestCase):
 
 class ModelTest(absltest.TestCase):
 
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    cls.params = prefabs.wdm_sim_params()
+    cls.spec = prefabs.wdm_spec()
+    cls.model = model.WdmModel(cls.params, cls.spec)
+
   def test_model_design_var(self):
     """Test of incorrectly sized design variable at various model inputs."""
-    params = prefabs.wdm_sim_params()
-    spec = prefabs.wdm_spec()
-    m = model.WdmModel(params, spec)
+    m = self.model
     with self.assertRaisesRegex(ValueError, 'Invalid design variable shape'):
       design_var = np.ones((10, 10))
       m.simulate(design_var)
@@ -114,9 +124,7 @@ class ModelTest(absltest.TestCase):
 
   def test_model_invalid_excitations(self):
     """Test of various invalid port excitations."""
-    params = prefabs.wdm_sim_params()
-    spec = prefabs.wdm_spec()
-    m = model.WdmModel(params, spec)
+    m = self.model
     with self.assertRaisesRegex(ValueError, 'Invalid port index'):
       design_var = np.ones(m.design_variable_shape)
       m.simulate(design_var, excite_port_idxs=(-1, 0))
@@ -132,13 +140,11 @@ class ModelTest(absltest.TestCase):
 
   def test_model_shape(self):
     """Test of consistently sized outputs w.r.t. inputs."""
-    params = prefabs.wdm_sim_params()
-    spec = prefabs.wdm_spec()
-    m = model.WdmModel(params, spec)
+    m = self.model
     design_var = np.ones(m.design_variable_shape)
     s_params, fields = m.simulate(design_var)
-    self.assertLen(params.wavelengths, fields.shape[0])
-    self.assertLen(params.wavelengths, s_params.shape[0])
+    self.assertLen(self.params.wavelengths, fields.shape[0])
+    self.assertLen(self.params.wavelengths, s_params.shape[0])
     self.assertLen(m.ports, s_params.shape[2])
     self.assertEqual(fields.shape[2:], m.shape)
     # The number of elements in mask should sum to the design region area
@@ -152,11 +158,43 @@ class ModelTest(absltest.TestCase):
     self.assertLen(excitation_ports, s_params.shape[1])
     self.assertLen(excitation_ports, fields.shape[1])
 
+  def test_model_repeated_simulations(self):
+    """Test that repeated simulations of a model match those of a new model."""
+    m = model.WdmModel(TINY_PARAMS, TINY_SPEC)
+    m.simulate(np.ones(m.design_variable_shape), excite_port_idxs=(0, 1))
+    design_var = np.zeros(m.design_variable_shape)
+    s_params, fields = m.simulate(design_var, excite_port_idxs=(0, 1))
+    s_params_new, fields_new = model.WdmModel(TINY_PARAMS, TINY_SPEC).simulate(
+        design_var, excite_port_idxs=(0, 1))
+    np.testing.assert_array_equal(s_params, s_params_new)
+    np.testing.assert_array_equal(fields, fields_new)
+
+  def test_model_simulations_after_background_change(self):
+    """Test that simulations track a change of the background permittivity."""
+    # Only a permittivity of the spec is changed. The shape, the design region
+    # coordinates, the background density and the ports of a model are derived
+    # from its spec once, on construction, and do not depend on permittivities,
+    # so they remain valid. A change of any geometric field of the spec needs a
+    # new model.
+    spec = dataclasses.replace(TINY_SPEC, slab_permittivity=6)
+    m = model.WdmModel(TINY_PARAMS, TINY_SPEC)
+    design_var = np.ones(m.design_variable_shape)
+    m.simulate(design_var, excite_port_idxs=(0, 1))
+    m.spec = spec
+    m_new = model.WdmModel(TINY_PARAMS, spec)
+    self.assertEqual(m.shape, m_new.shape)
+    self.assertEqual(m.design_region_coords, m_new.design_region_coords)
+    np.testing.assert_array_equal(m.density_bg, m_new.density_bg)
+    s_params, fields = m.simulate(design_var, excite_port_idxs=(0, 1))
+    s_params_new, fields_new = m_new.simulate(
+        design_var, excite_port_idxs=(0, 1))
+    np.testing.assert_array_equal(s_params, s_params_new)
+    np.testing.assert_array_equal(fields, fields_new)
+
   def test_model_epsilon_r_bounds(self):
     """Test of model epsilon_r output value bounds, e.g. min and max."""
-    params = prefabs.wdm_sim_params()
-    spec = prefabs.wdm_spec()
-    m = model.WdmModel(params, spec)
+    m = self.model
+    spec = self.spec
     self.assertEqual(m.epsilon_r_bg().min(), spec.cladding_permittivity)
     self.assertEqual(m.epsilon_r_bg().max(), spec.slab_permittivity)
     design_var = np.ones(m.design_variable_shape)